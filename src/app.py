@@ -9,14 +9,12 @@ Run with:
     streamlit run src/app.py
 """
 
-import sqlite3
+import json
 import pandas as pd
 import streamlit as st
 import altair as alt
-import os
-
-# Path to the SQLite database (placed at project root level)
-DB_PATH = os.path.join(os.path.dirname(__file__), "..", "fleet_maintenance.db")
+# Pooled WAL connections: the dashboard keeps reading while the optimizer writes
+from utils import get_db_connection
 
 def load_schedule():
     """
@@ -25,10 +23,62 @@ def load_schedule():
     Returns:
         pd.DataFrame: DataFrame containing all recorrds from the maintenance_records table.
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_db_connection()
     query = "SELECT * FROM maintenance_records"
     df = pd.read_sql_query(query, conn)
     conn.close()
+    # TEXT or TIMESTAMP columns depending on how the table was written
+    for col in ("schedule_start", "schedule_end"):
+        df[col] = pd.to_datetime(df[col])
+    return df
+
+def load_alternative_runs(run_id):
+    """
+    Load the stored alternative schedules (optimizer.py --top-k) of one solve, without their dates.
+
+    Args:
+        run_id (str): Run that wrote the current maintenance records
+
+    Returns:
+        pd.DataFrame: run_id, rank, objective, status and created_at per alternative;
+                      empty when the run saved no alternatives.
+    """
+    conn = get_db_connection()
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schedule_alternatives'").fetchone()
+    if exists is None:
+        conn.close()
+        return pd.DataFrame(columns=["run_id", "rank", "objective", "status", "created_at"])
+    query = ("SELECT run_id, rank, objective, status, created_at FROM schedule_alternatives "
+             "WHERE run_id = ? ORDER BY rank")
+    df = pd.read_sql_query(query, conn, params=(run_id,))
+    conn.close()
+    return df
+
+def apply_alternative(df, run_id, rank):
+    """
+    Replace the schedule dates in df with those of one stored alternative.
+    Part allocations do not change between alternatives, so only dates are swapped.
+
+    Args:
+        df (pd.DataFrame): Maintenance records
+        run_id (str): Run the alternative belongs to
+        rank (int): Alternative within the run (0 = the schedule the optimizer returned)
+
+    Returns:
+        pd.DataFrame: Records with the alternative's schedule_start and schedule_end.
+    """
+    conn = get_db_connection()
+    plan_date, aircraft_json, starts_json, durations_json = conn.execute(
+        "SELECT plan_date, aircraft_json, starts_json, durations_json FROM schedule_alternatives "
+        "WHERE run_id = ? AND rank = ?", (run_id, int(rank))).fetchone()
+    conn.close()
+    starts = pd.Series(json.loads(starts_json), index=json.loads(aircraft_json))
+    ends = starts + pd.Series(json.loads(durations_json), index=starts.index)
+    base = pd.Timestamp(plan_date)
+    df = df.copy()
+    df["schedule_start"] = base + pd.to_timedelta(df["aircraft_id"].map(starts), unit="D")
+    df["schedule_end"] = base + pd.to_timedelta(df["aircraft_id"].map(ends), unit="D")
     return df
 
 def main():
@@ -60,6 +110,25 @@ def main():
     if df.empty:
         st.warning("No maintenance records found. Please run data_sim.py and optimizer.py first.")
         return
+
+    # Alternative schedules: switch dates without re-solving, only for the solve
+    # that wrote every current record (not after a re-plan or a sharded run)
+    run_ids = df["run_id"].unique() if "run_id" in df.columns else []
+    run = pd.DataFrame()
+    if len(run_ids) == 1 and pd.notna(run_ids[0]):
+        run_id = run_ids[0]
+        run = load_alternative_runs(run_id)
+    if not run.empty:
+        st.sidebar.subheader("Alternative Schedules")
+        st.sidebar.caption(f"Solve run {run_id}")
+        labels = {row.rank: f"#{row.rank} - objective {row.objective:,.0f} ({row.status})"
+                  for row in run.itertuples()}
+        rank = st.sidebar.radio("Alternative", list(labels), format_func=labels.get)
+        if rank != 0:
+            returned = apply_alternative(df, run_id, 0)
+            df = apply_alternative(df, run_id, rank)
+            moved = (df["schedule_start"] != returned["schedule_start"]).sum()
+            st.sidebar.metric("Aircraft moved vs #0", int(moved))
     
     # KPIs Section
     st.subheader("📊 Key Metrics")
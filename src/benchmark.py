@@ -0,0 +1,595 @@
+"""
+benchmark.py
+-------------
+Performance benchmarks for the optimizer pipeline.
+
+Each benchmark is a subcommand; data comes from data_sim with fixed seeds so
+runs are comparable between commits.
+
+Run with:
+    python src/benchmark.py allocation --aircraft 10000 --parts 5000
+    python src/benchmark.py greedy --aircraft 100000
+    python src/benchmark.py prep --aircraft 100000
+    python src/benchmark.py db --aircraft 200000 --readers 4
+    python src/benchmark.py bulk --rows 1000000
+    python src/benchmark.py ingest --rows 250000 1000000 2000000 --chunk-rows 100000
+    python src/benchmark.py ingest-files --rows 1000000 --files 24 --workers 1 2 4
+    python src/benchmark.py optimizer --sizes 50 500 --horizons 30 90
+"""
+
+import argparse
+import contextlib
+import csv
+import hashlib
+import io
+import json
+import math
+import multiprocessing
+import resource
+import sqlite3
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from ortools.sat.python import cp_model
+import data_sim
+import db_setup
+import ingest
+import optimizer
+import utils
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = PROJECT_ROOT / "benchmark_results"
+
+# Default optimizer benchmark grid
+FLEET_SIZES = [50, 500, 5000, 50000]
+HORIZONS = [30, 90, 365]
+# Start-day domain of the prep benchmark's extraction model
+PREP_HORIZON = 30
+# Database settings compared by the db benchmark (utils constants); "legacy" is
+# SQLite's defaults with a new connection per call
+DB_BENCH_MODES = {
+    "legacy": {"SQLITE_JOURNAL_MODE": "DELETE", "SQLITE_SYNCHRONOUS": "FULL", "SQLITE_CACHE_SIZE_KIB": 2000,
+               "SQLITE_MMAP_SIZE": 0, "SQLITE_POOL_CONNECTIONS": False},
+    "wal": {},
+}
+# Dashboard-style query timed by the db benchmark
+DB_BENCH_QUERY = "SELECT * FROM maintenance_records ORDER BY schedule_start LIMIT 20"
+
+def legacy_allocate_parts(num_aircraft, parts_df, draws):
+    """
+    Reference row-by-row allocator (the original pandas while loop), driven by the
+    same uniform draws as optimizer.allocate_parts so results can be compared.
+    """
+    parts_copy = parts_df.copy().sort_values("quantity_on_hand", ascending=False).reset_index(drop=True)
+    part_idx = 0
+    total_parts_available = int(parts_copy["quantity_on_hand"].sum()) if not parts_copy.empty else 0
+    part_ids, quantities = [], []
+    for i in range(num_aircraft):
+        part_id = None
+        part_quantity = 0
+        if total_parts_available > 0 and not parts_copy.empty:
+            attempts = 0
+            allocated = False
+            while attempts < len(parts_copy) and not allocated:
+                if part_idx >= len(parts_copy):
+                    part_idx = 0
+                prow = parts_copy.loc[part_idx]
+                avail = int(prow["quantity_on_hand"])
+                if avail > 0:
+                    part_id = prow["part_id"]
+                    part_quantity = 1 + int(draws[i] * min(3, avail))
+                    parts_copy.at[part_idx, "quantity_on_hand"] = avail - part_quantity
+                    total_parts_available -= part_quantity
+                    allocated = True
+                    part_idx = (part_idx + 1) % len(parts_copy)
+                else:
+                    part_idx = (part_idx + 1) % len(parts_copy)
+                    attempts += 1
+        part_ids.append(part_id)
+        quantities.append(part_quantity)
+    return part_ids, quantities
+
+def bench_allocation(num_aircraft, num_parts, seed, skip_legacy):
+    """
+    Times optimizer.allocate_parts against the legacy loop and checks both
+    produce the same allocation.
+    """
+    np.random.seed(seed)
+    parts_df = data_sim.generate_parts_inventory(num_parts)
+
+    started = time.perf_counter()
+    part_ids, quantities, _ = optimizer.allocate_parts(num_aircraft, parts_df, seed=seed)
+    vectorized = time.perf_counter() - started
+    print(f"allocate_parts: {num_aircraft} aircraft x {num_parts} parts in {vectorized:.4f}s "
+          f"({num_aircraft / vectorized:,.0f} aircraft/s)")
+
+    if skip_legacy:
+        return
+    draws = np.random.default_rng(seed).random(num_aircraft)
+    started = time.perf_counter()
+    legacy_ids, legacy_quantities = legacy_allocate_parts(num_aircraft, parts_df, draws)
+    legacy = time.perf_counter() - started
+    print(f"legacy loop:    {num_aircraft} aircraft x {num_parts} parts in {legacy:.4f}s "
+          f"({num_aircraft / legacy:,.0f} aircraft/s)")
+    same = list(part_ids) == legacy_ids and list(quantities) == legacy_quantities
+    print(f"speedup: {legacy / vectorized:.1f}x, identical allocation: {same}")
+
+def bench_greedy(num_aircraft, seed):
+    """
+    Times optimizer.greedy_schedule and reports its weighted-start objective.
+    Weights are computed beforehand so only the scheduler itself is timed.
+    """
+    np.random.seed(seed)
+    fleet_df = data_sim.generate_fleet(num_aircraft)
+    weights = optimizer.compute_weights(fleet_df)
+
+    started = time.perf_counter()
+    start_days, _, objective = optimizer.greedy_schedule(fleet_df, weights)
+    elapsed = time.perf_counter() - started
+    last_day = max(start_days.values()) if start_days else 0
+    print(f"greedy_schedule: {num_aircraft} aircraft, {optimizer.CREW_AVAILABLE} crews in {elapsed:.4f}s "
+          f"({num_aircraft / elapsed:,.0f} aircraft/s)")
+    print(f"objective (sum start_day x weight): {objective:,}, last start day: {last_day}")
+
+def legacy_compute_weights(fleet_df):
+    """
+    Reference iterrows() weight computation (the original compute_weights).
+    """
+    max_hours = int(fleet_df["hours_until_due"].max()) if len(fleet_df) else 1
+    weights = {}
+    for _, row in fleet_df.iterrows():
+        urgency = int(row["hours_until_due"])
+        weights[row["aircraft_id"]] = max(1, int(((max_hours - urgency) / max_hours) * 100))
+    return weights
+
+def legacy_schedule_rows(aircraft_ids, start_days, durations, part_ids, quantities, costs):
+    """
+    Reference row-by-row schedule builder (the original build_schedule_df loop),
+    calling pd.Timestamp.now() twice per aircraft.
+    """
+    rows = []
+    for aid, part_id, part_quantity, cost in zip(aircraft_ids, part_ids, quantities, costs):
+        s = start_days[aid]
+        rows.append({
+            "aircraft_id": aid,
+            "schedule_start": pd.Timestamp.now().normalize() + pd.Timedelta(days=s),
+            "schedule_end": pd.Timestamp.now().normalize() + pd.Timedelta(days=s + durations[aid]),
+            "part_id": part_id,
+            "part_quantity": int(part_quantity),
+            "cost": float(cost),
+            "status": "SCHEDULED",
+        })
+    return pd.DataFrame(rows)
+
+def bench_prep(num_aircraft, seed):
+    """
+    Times the pre- and post-processing around the solver at num_aircraft rows:
+    urgency weights, solution extraction and schedule assembly, each against its
+    legacy per-row implementation. Extraction reads a trivially solved model with
+    one start and one duration variable per aircraft.
+    """
+    np.random.seed(seed)
+    fleet_df = data_sim.generate_fleet(num_aircraft)
+    parts_df = data_sim.generate_parts_inventory()
+    aircraft_list = fleet_df["aircraft_id"].tolist()
+
+    def timed(label, fn, *args):
+        started = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - started
+        print(f"{label:<28} {elapsed:8.4f}s  {elapsed / num_aircraft * 1e6:8.2f} us/aircraft")
+        return result, elapsed
+
+    print(f"{num_aircraft} aircraft")
+    weights, fast = timed("compute_weights", optimizer.compute_weights, fleet_df)
+    legacy_weights, slow = timed("  legacy iterrows", legacy_compute_weights, fleet_df)
+    print(f"  speedup {slow / fast:.1f}x, identical: {weights == legacy_weights}")
+
+    model = cp_model.CpModel()
+    start_day = {aid: model.NewIntVar(0, PREP_HORIZON - 1, f"start_{aid}") for aid in aircraft_list}
+    duration = {aid: model.NewIntVar(optimizer.MAINT_DURATION_MIN, optimizer.MAINT_DURATION_MAX, f"dur_{aid}")
+                for aid in aircraft_list}
+    solver = cp_model.CpSolver()
+    solver.parameters.num_search_workers = 1
+    solver.Solve(model)
+    (start_days, durations), fast = timed("read_solution", optimizer.read_solution,
+                                          solver, start_day, duration, aircraft_list)
+    _, slow = timed("  legacy solver.Value loop", lambda: (
+        {aid: int(solver.Value(start_day[aid])) for aid in aircraft_list},
+        {aid: int(solver.Value(duration[aid])) for aid in aircraft_list}))
+    print(f"  speedup {slow / fast:.1f}x")
+
+    allocation = optimizer.allocate_parts(num_aircraft, parts_df)
+    schedule_df, fast = timed("build_schedule_df", optimizer.build_schedule_df,
+                              fleet_df, parts_df, start_days, durations, allocation)
+    legacy_df, slow = timed("  legacy row loop", legacy_schedule_rows,
+                            aircraft_list, start_days, durations, *allocation)
+    print(f"  speedup {slow / fast:.1f}x, identical: {schedule_df.equals(legacy_df)}")
+
+    timed("schedule_day_offsets", optimizer.schedule_day_offsets, schedule_df)
+
+def bench_db_concurrency(num_aircraft, readers, writes, seed):
+    """
+    Times dashboard-style reads while save_schedule_to_db rewrites a schedule of
+    num_aircraft rows, once per DB_BENCH_MODES entry (each on a fresh temporary
+    database). Reports read latency percentiles, reads completed and failed reads
+    (e.g. lock timeouts).
+    """
+    np.random.seed(seed)
+    fleet_df = data_sim.generate_fleet(num_aircraft)
+    parts_df = data_sim.generate_parts_inventory()
+    start_days, durations, _ = optimizer.greedy_schedule(fleet_df)
+    schedule_df = optimizer.build_schedule_df(fleet_df, parts_df, start_days, durations)
+    defaults = {name: getattr(utils, name) for name in ("DB_PATH", *DB_BENCH_MODES["legacy"])}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for mode, settings in DB_BENCH_MODES.items():
+            for name, value in {**defaults, **settings, "DB_PATH": str(Path(tmp_dir) / f"{mode}.db")}.items():
+                setattr(utils, name, value)
+            utils.execute_script(db_setup.SQL_SCRIPT)
+            utils.bulk_load_table("fleet", fleet_df)
+            utils.bulk_load_table("parts_inventory", parts_df)
+            with contextlib.redirect_stdout(io.StringIO()):
+                optimizer.save_schedule_to_db(schedule_df)
+
+            latencies = []
+            errors = []
+            writing = threading.Event()
+            writing.set()
+
+            def read_loop():
+                while writing.is_set():
+                    started = time.perf_counter()
+                    try:
+                        utils.df_from_query(DB_BENCH_QUERY)
+                        latencies.append(time.perf_counter() - started)
+                    except (sqlite3.Error, pd.errors.DatabaseError) as e:
+                        errors.append(str(e).rsplit(": ", 1)[-1])
+                utils.close_db_connections()
+
+            threads = [threading.Thread(target=read_loop) for _ in range(readers)]
+            for thread in threads:
+                thread.start()
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(writes):
+                    optimizer.save_schedule_to_db(schedule_df)
+            write_time = (time.perf_counter() - started) / writes
+            writing.clear()
+            for thread in threads:
+                thread.join()
+            utils.close_db_connections()
+
+            ms = np.array(latencies) * 1000 if latencies else np.zeros(1)
+            print(f"{mode:>6}: write {write_time:.2f}s/save, {len(latencies)} reads, "
+                  f"p50 {np.percentile(ms, 50):.1f}ms, p95 {np.percentile(ms, 95):.1f}ms, "
+                  f"max {ms.max():.1f}ms, {len(errors)} read errors {sorted(set(errors))}")
+
+    for name, value in defaults.items():
+        setattr(utils, name, value)
+
+def _to_sql_replace(table, df):
+    """
+    The loader bulk_load_table replaced: drops and re-creates the table with inferred types.
+    """
+    conn = utils.get_db_connection()
+    df.to_sql(table, conn, if_exists="replace", index=False)
+    conn.close()
+    return len(df)
+
+def bench_bulk_load(num_rows, seed):
+    """
+    Loads a num_rows fleet and its num_rows maintenance_records schedule into a
+    fresh db_setup database with pandas to_sql(if_exists="replace") and with
+    utils.bulk_load_table, twice each (into empty tables, then over the loaded
+    rows). Reports rows/s and whether maintenance_records kept its primary key
+    and foreign keys.
+    """
+    np.random.seed(seed)
+    fleet_df = data_sim.generate_fleet(num_rows)
+    parts_df = data_sim.generate_parts_inventory()
+    rng = np.random.default_rng(seed)
+    aircraft_list = fleet_df["aircraft_id"].tolist()
+    start_days = dict(zip(aircraft_list, rng.integers(0, PREP_HORIZON, num_rows).tolist()))
+    durations = dict(zip(aircraft_list, fleet_df["maint_duration_days"].tolist()))
+    schedule_df = optimizer.build_schedule_df(fleet_df, parts_df, start_days, durations)
+    default_path = utils.DB_PATH
+
+    print(f"{num_rows} rows per table")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for label, load in (("to_sql replace", _to_sql_replace), ("bulk_load_table", utils.bulk_load_table)):
+            utils.DB_PATH = str(Path(tmp_dir) / f"{load.__name__}.db")
+            utils.execute_script(db_setup.SQL_SCRIPT)
+            for load_round in ("empty", "reload"):
+                for table, df in (("fleet", fleet_df), ("parts_inventory", parts_df),
+                                  ("maintenance_records", schedule_df)):
+                    started = time.perf_counter()
+                    load(table, df)
+                    elapsed = time.perf_counter() - started
+                    if len(df) == num_rows:
+                        print(f"{label:<16} {load_round:<7} {table:<20} {elapsed:7.2f}s  "
+                              f"{num_rows / elapsed:10,.0f} rows/s")
+            conn = utils.get_db_connection()
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(maintenance_records)")]
+            foreign_keys = conn.execute("PRAGMA foreign_key_list(maintenance_records)").fetchall()
+            conn.close()
+            print(f"{label:<16} maintenance_id kept: {'maintenance_id' in columns}, "
+                  f"foreign keys kept: {len(foreign_keys)}")
+            utils.close_db_connections()
+    utils.DB_PATH = default_path
+
+def _peak_rss_mb():
+    """
+    Peak RSS of this process image in MB. VmHWM, unlike ru_maxrss, is not carried
+    over from the parent across the exec of a spawned worker.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _ingest_case(csv_path, db_path, chunk_rows):
+    """
+    Process-pool worker: ingests csv_path into fleet of a fresh database and returns
+    rows/s with the process's peak RSS before and after the load.
+    """
+    utils.DB_PATH = db_path
+    utils.execute_script(db_setup.SQL_SCRIPT)
+    rss_before = _peak_rss_mb()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ingest.ingest_csv_to_table(csv_path, "fleet", chunk_rows)
+    elapsed = time.perf_counter() - started
+    rows = utils.df_from_query("SELECT COUNT(*) AS n FROM fleet")["n"].iat[0]
+    utils.close_db_connections()
+    return rows / elapsed, rss_before, _peak_rss_mb()
+
+def bench_ingest(sizes, chunk_rows, seed):
+    """
+    Ingests fleet CSVs of each size, whole-file and streamed in chunk_rows chunks.
+    Each load runs in a freshly spawned process so its peak RSS is its own.
+    """
+    spawn = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for num_rows in sizes:
+            np.random.seed(seed)
+            csv_path = Path(tmp_dir) / f"fleet_{num_rows}.csv"
+            data_sim.generate_fleet(num_rows).to_csv(csv_path, index=False)
+            size_mb = csv_path.stat().st_size / 2**20
+            for label, chunks in (("whole file", None), (f"{chunk_rows}-row chunks", chunk_rows)):
+                db_path = str(Path(tmp_dir) / "ingest.db")
+                with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                    rate, rss_before, rss_peak = pool.submit(_ingest_case, str(csv_path), db_path, chunks).result()
+                for suffix in ("", "-wal", "-shm"):
+                    Path(db_path + suffix).unlink(missing_ok=True)
+                print(f"{num_rows:>8} rows ({size_mb:6.1f} MB) {label:<20} {rate:10,.0f} rows/s  "
+                      f"peak RSS {rss_peak:7.1f} MB (+{rss_peak - rss_before:.1f} MB for the load)")
+    # Page cache and memory-mapped database pages grow with the database up to these caps
+    print(f"SQLite's own share is capped at {utils.SQLITE_CACHE_SIZE_KIB / 1024:.0f} MB page cache + "
+          f"{utils.SQLITE_MMAP_SIZE / 2**20:.0f} MB mmap")
+
+def bench_ingest_files(num_rows, num_files, workers, chunk_rows, seed):
+    """
+    Splits a num_rows fleet into num_files per-station CSVs and ingests them with
+    ingest.ingest_files_parallel for each parse-worker count, on a fresh database.
+    """
+    np.random.seed(seed)
+    fleet_df = data_sim.generate_fleet(num_rows)
+    default_path = utils.DB_PATH
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for station, rows in enumerate(np.array_split(np.arange(num_rows), num_files)):
+            fleet_df.iloc[rows].to_csv(Path(tmp_dir) / f"fleet_ST{station:02d}.csv", index=False)
+        del fleet_df
+        files = ingest.discover_ingest_files(tmp_dir)
+        print(f"{num_rows} rows in {num_files} files")
+        for max_workers in workers:
+            utils.DB_PATH = str(Path(tmp_dir) / f"ingest_{max_workers}.db")
+            utils.execute_script(db_setup.SQL_SCRIPT)
+            with contextlib.redirect_stdout(io.StringIO()):
+                stats = ingest.ingest_files_parallel(files, max_workers, chunk_rows)
+            print(f"{max_workers:>3} parse workers: {stats.attrs['wall_seconds']:7.2f}s wall, "
+                  f"{stats.attrs['rows_per_s']:10,.0f} rows/s, per-file parse median "
+                  f"{stats['parse_rows_per_s'].median():10,.0f} rows/s")
+            utils.close_db_connections()
+    utils.DB_PATH = default_path
+
+def _git_revision():
+    """
+    Returns the current git commit hash, or "unknown" outside a git checkout.
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def _auto_crew(num_aircraft, horizon):
+    """
+    Crew count that leaves ~20% slack, so every grid point is feasible.
+    """
+    return max(optimizer.CREW_AVAILABLE, math.ceil(1.2 * num_aircraft * optimizer.MAINT_DURATION_MIN / horizon))
+
+def run_optimizer_case(num_aircraft, horizon, crew, formulation, time_limit, seed, greedy_hint=False, workers=8,
+                       deterministic=False):
+    """
+    Builds and solves one grid point, in a fresh process so peak RSS is per case.
+
+    Returns:
+        dict: One benchmark record
+    """
+    np.random.seed(seed)
+    fleet_df = data_sim.generate_fleet(num_aircraft)
+    optimizer.PLANNING_HORIZON_DAYS = horizon
+    optimizer.CREW_AVAILABLE = crew
+
+    started = time.perf_counter()
+    model, start_day, duration, _, _ = optimizer.build_model(fleet_df, formulation=formulation)
+    if greedy_hint:
+        start_days, durations, _ = optimizer.greedy_schedule(fleet_df)
+        for aid, s in start_days.items():
+            if s < horizon:
+                model.AddHint(start_day[aid], s)
+                model.AddHint(duration[aid], durations[aid])
+    build_time = time.perf_counter() - started
+    proto = model.Proto()
+
+    # Presolve alone, then the full solve with the production parameters
+    presolver = cp_model.CpSolver()
+    presolver.parameters.stop_after_presolve = True
+    presolver.parameters.max_time_in_seconds = time_limit
+    presolver.parameters.random_seed = optimizer.SOLVER_SEED
+    started = time.perf_counter()
+    presolver.Solve(model)
+    presolve_time = time.perf_counter() - started
+
+    solver_config = optimizer.SolverConfig(workers=workers, time_limit=time_limit, deterministic=deterministic)
+    solver = solver_config.apply(cp_model.CpSolver())
+    status = solver.Solve(model)
+    has_solution = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    objective = solver.ObjectiveValue() if has_solution else None
+    bound = solver.BestObjectiveBound()
+    # Fingerprint of the assignment, to check deterministic runs are bit-identical
+    solution_hash = None
+    if has_solution:
+        start_days, durations = optimizer.read_solution(solver, start_day, duration, list(start_day))
+        solution_hash = hashlib.sha256(json.dumps([start_days, durations]).encode()).hexdigest()[:16]
+
+    return {
+        "aircraft": num_aircraft,
+        "horizon": horizon,
+        "crew": crew,
+        "formulation": formulation,
+        "greedy_hint": greedy_hint,
+        "workers": workers,
+        "deterministic": deterministic,
+        "build_time": round(build_time, 4),
+        "presolve_time": round(presolve_time, 4),
+        "solve_time": round(solver.WallTime(), 4),
+        "status": solver.StatusName(status),
+        "objective": objective,
+        "best_bound": bound,
+        "gap": abs(objective - bound) / max(1.0, abs(objective)) if has_solution else None,
+        "solution_hash": solution_hash,
+        "num_variables": len(proto.variables),
+        "num_constraints": len(proto.constraints),
+        # ru_maxrss is KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+def bench_optimizer(sizes, horizons, crew, formulation, time_limit, seed, output, greedy_hint=False, workers=8,
+                    deterministic=False):
+    """
+    Runs the optimizer over a fleet size x horizon grid and writes the records to
+    <output>.json and <output>.csv, tagged with the git revision.
+    """
+    revision = _git_revision()
+    records = []
+    for num_aircraft in sizes:
+        for horizon in horizons:
+            case_crew = crew if crew else _auto_crew(num_aircraft, horizon)
+            # One process per case keeps peak memory measurements independent
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                record = pool.submit(run_optimizer_case, num_aircraft, horizon, case_crew,
+                                     formulation, time_limit, seed, greedy_hint, workers,
+                                     deterministic).result()
+            record["revision"] = revision
+            records.append(record)
+            print(f"{num_aircraft:>6} aircraft, {horizon:>3} days, {case_crew:>4} crews: "
+                  f"build {record['build_time']:.2f}s, solve {record['solve_time']:.2f}s, "
+                  f"{record['status']}, gap {record['gap']}")
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.with_suffix(".json").write_text(json.dumps(records, indent=2))
+    with open(output.with_suffix(".csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(records[0]))
+        writer.writeheader()
+        writer.writerows(records)
+    print("Results written to", output.with_suffix(".json"), "and", output.with_suffix(".csv"))
+
+def main():
+    parser = argparse.ArgumentParser(description="Optimizer performance benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    alloc = subparsers.add_parser("allocation", help="Parts allocation throughput")
+    alloc.add_argument("--aircraft", type=int, default=10000)
+    alloc.add_argument("--parts", type=int, default=5000)
+    alloc.add_argument("--seed", type=int, default=data_sim.RANDOM_SEED)
+    alloc.add_argument("--skip-legacy", action="store_true", help="Only time the vectorized allocator")
+
+    greedy = subparsers.add_parser("greedy", help="Greedy list scheduler throughput")
+    greedy.add_argument("--aircraft", type=int, default=100000)
+    greedy.add_argument("--seed", type=int, default=data_sim.RANDOM_SEED)
+
+    prep = subparsers.add_parser("prep", help="Weights, solution extraction and schedule assembly overhead")
+    prep.add_argument("--aircraft", type=int, default=100000)
+    prep.add_argument("--seed", type=int, default=data_sim.RANDOM_SEED)
+
+    db = subparsers.add_parser("db", help="Read latency while save_schedule_to_db writes (legacy vs WAL)")
+    db.add_argument("--aircraft", type=int, default=200000, help="Rows in the written schedule")
+    db.add_argument("--readers", type=int, default=4, help="Concurrent reader threads")
+    db.add_argument("--writes", type=int, default=3, help="Schedule saves per mode")
+    db.add_argument("--seed", type=int, default=data_sim.RANDOM_SEED)
+
+    bulk = subparsers.add_parser("bulk", help="to_sql replace vs bulk_load_table")
+    bulk.add_argument("--rows", type=int, default=1000000, help="Rows per loaded table")
+    bulk.add_argument("--seed", type=int, default=data_sim.RANDOM_SEED)
+
+    ing = subparsers.add_parser("ingest", help="Whole-file vs chunked CSV ingest: rows/s and peak RSS")
+    ing.add_argument("--rows", type=int, nargs="+", default=[250000, 1000000], help="CSV sizes (rows)")
+    ing.add_argument("--chunk-rows", type=int, default=ingest.INGEST_CHUNK_ROWS, help="Rows per streamed chunk")
+    ing.add_argument("--seed", type=int, default=data_sim.RANDOM_SEED)
+
+    files = subparsers.add_parser("ingest-files", help="Parallel multi-file ingest by parse-worker count")
+    files.add_argument("--rows", type=int, default=1000000, help="Total fleet rows")
+    files.add_argument("--files", type=int, default=24, help="Per-station files the rows are split into")
+    files.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Parse worker counts to compare")
+    files.add_argument("--chunk-rows", type=int, default=ingest.INGEST_CHUNK_ROWS, help="Rows per parsed batch")
+    files.add_argument("--seed", type=int, default=data_sim.RANDOM_SEED)
+
+    opt = subparsers.add_parser("optimizer", help="Model build/solve across fleet sizes and horizons")
+    opt.add_argument("--sizes", type=int, nargs="+", default=FLEET_SIZES)
+    opt.add_argument("--horizons", type=int, nargs="+", default=HORIZONS)
+    opt.add_argument("--crew", type=int, default=0, help="Crew count (default: scaled to fit each case)")
+    opt.add_argument("--formulation", choices=sorted(optimizer.MODEL_BUILDERS), default=optimizer.MODEL_FORMULATION)
+    opt.add_argument("--time-limit", type=float, default=30.0, help="Solver time limit per case (seconds)")
+    opt.add_argument("--workers", type=int, default=8, help="CP-SAT search workers")
+    opt.add_argument("--deterministic", action="store_true",
+                     help="Deterministic solves (time limit in deterministic time), comparable across runs")
+    opt.add_argument("--greedy-hint", action="store_true", help="Hint CP-SAT with the greedy plan (timed as build)")
+    opt.add_argument("--seed", type=int, default=data_sim.RANDOM_SEED)
+    opt.add_argument("--output", default=str(RESULTS_DIR / "optimizer"),
+                     help="Output path without extension (.json and .csv are written)")
+
+    args = parser.parse_args()
+    if args.benchmark == "allocation":
+        bench_allocation(args.aircraft, args.parts, args.seed, args.skip_legacy)
+    elif args.benchmark == "greedy":
+        bench_greedy(args.aircraft, args.seed)
+    elif args.benchmark == "prep":
+        bench_prep(args.aircraft, args.seed)
+    elif args.benchmark == "db":
+        bench_db_concurrency(args.aircraft, args.readers, args.writes, args.seed)
+    elif args.benchmark == "bulk":
+        bench_bulk_load(args.rows, args.seed)
+    elif args.benchmark == "ingest":
+        bench_ingest(args.rows, args.chunk_rows, args.seed)
+    elif args.benchmark == "ingest-files":
+        bench_ingest_files(args.rows, args.files, args.workers, args.chunk_rows, args.seed)
+    elif args.benchmark == "optimizer":
+        bench_optimizer(args.sizes, args.horizons, args.crew, args.formulation,
+                        args.time_limit, args.seed, args.output, args.greedy_hint, args.workers,
+                        args.deterministic)
+
+if __name__ == "__main__":
+    main()
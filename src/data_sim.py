@@ -14,18 +14,35 @@ RANDOM_SEED = 42
 np.random.seed(RANDOM_SEED)
 # Default number of aircraft to generate for the fleet dataset.
 NUM_AIRCRAFT = 50 # Can be scaled to generate more aircraft if needed.
+# Maintenance bases; each has its own crew and aircraft (see optimizer.CREW_BY_BASE).
+BASES = ["BASE-NORTH", "BASE-SOUTH", "BASE-EAST"]
+# Check types: name -> (maintenance duration in days, crews needed).
+CHECK_TYPES = {"A-CHECK": (1, 1), "B-CHECK": (2, 1), "C-CHECK": (2, 2)}
+# Aircraft on long maintenance intervals come due for heavier checks (interval hours at or above).
+CHECK_INTERVAL_THRESHOLDS = {"C-CHECK": 1180, "B-CHECK": 1150}
+# Flight hours per day are clipped to this range (turns hours_until_due into a due date).
+DAILY_UTILIZATION_RANGE = (4.0, 16.0)
+# Resources per base: hangar bays, structures engineers for heavy checks, heavy-check tooling.
+# No resource is shared between bases, so the fleet can still be solved per base (optimizer.py --shard).
+HANGAR_BAYS_PER_BASE = 2
+STRUCTURES_CREWS = 1 # Licensed structures engineers per base (B/C checks); off on weekends
+HEAVY_TOOLING_KITS = 1 # Jacking/tooling kits per base (C checks)
+HOLIDAYS = ["01-01", "12-25"] # Month-day of days every resource is closed
+CALENDAR_DAYS = 90 # Days ahead covered by the resource calendar
 
-def generate_fleet(num_aircraft: int = NUM_AIRCRAFT):
+def generate_fleet(num_aircraft: int = NUM_AIRCRAFT, bases: list = BASES):
     """
     Generate a simulated dataset representing a fleet of aircraft.
 
     Args:
         num_aircraft (int): Number of aircraft records to generate.
+        bases (list): Maintenance bases, assigned to aircraft in rotation.
 
     Returns:
-        pd.DataFrame: DataFrame containing aircraft IDs, flight hours,
+        pd.DataFrame: DataFrame containing aircraft IDs, home bases, flight hours,
                       maintenance intervals, last maintenance dates,
-                      and calculated maintenance metrics.
+                      calculated maintenance metrics, daily utilization, and
+                      the due check type with its duration and crew demand.
     """
     # Create aircraft IDs in the format "AIR-####"
     aircraft_ids = [f"AIR-{1001 + i}" for i in range(num_aircraft)]
@@ -36,9 +53,13 @@ def generate_fleet(num_aircraft: int = NUM_AIRCRAFT):
     # Calculate last maintenance date based on days since last maintenance
     last_maintenance_date = [(datetime.utcnow() - pd.Timedelta(days=int(d))).date().isoformat() for d in days_since_maint]
 
+    # Home base per aircraft (rotation keeps the random draws above unchanged)
+    home_base = [bases[i % len(bases)] for i in range(num_aircraft)]
+
     # Build fleet dataset
     df = pd.DataFrame({
         "aircraft_id": aircraft_ids,
+        "base": home_base,
         "flight_hours": flight_hours,
         "maint_interval_hours": maint_interval_hours,
         "last_maintenance_date": last_maintenance_date
@@ -46,6 +67,15 @@ def generate_fleet(num_aircraft: int = NUM_AIRCRAFT):
     # Derived fields: maintenance metrics
     df["hours_since_last_maintenance"] = df["flight_hours"] % df["maint_interval_hours"]
     df["hours_until_due"] = df["maint_interval_hours"] - df["hours_since_last_maintenance"]
+    # Average flight hours per day since the last maintenance (no extra random draws)
+    df["daily_utilization_hours"] = (df["hours_since_last_maintenance"] / days_since_maint).clip(
+        *DAILY_UTILIZATION_RANGE).round(1)
+    # Due check type (derived from the interval, so no extra random draws)
+    df["check_type"] = np.select(
+        [df["maint_interval_hours"] >= hours for hours in CHECK_INTERVAL_THRESHOLDS.values()],
+        list(CHECK_INTERVAL_THRESHOLDS), default="A-CHECK")
+    df["maint_duration_days"] = df["check_type"].map(lambda check: CHECK_TYPES[check][0])
+    df["crew_demand"] = df["check_type"].map(lambda check: CHECK_TYPES[check][1])
     return df
 
 def generate_parts_inventory(num_parts: int = 20): # Can change the amount of parts required
@@ -75,12 +105,59 @@ def generate_parts_inventory(num_parts: int = 20): # Can change the amount of pa
     })
     return df
 
+def generate_resources(fleet_df: pd.DataFrame, calendar_days: int = CALENDAR_DAYS):
+    """
+    Generate a resource catalog, its capacity calendar and per-aircraft demand.
+
+    Args:
+        fleet_df (pd.DataFrame): Fleet dataset (uses base and check_type).
+        calendar_days (int): Number of days ahead covered by the calendar.
+
+    Returns:
+        tuple: (resources, resource_calendar, resource_demand) DataFrames.
+    """
+    # Catalog: hangar, skilled crews and tooling at each base
+    bases = sorted(fleet_df["base"].unique())
+    resources = pd.DataFrame(
+        [(f"HANGAR-{base}", "HANGAR", f"hangar bays at {base}", HANGAR_BAYS_PER_BASE) for base in bases] +
+        [(f"CREW-STRUCTURES-{base}", "CREW", f"licensed structures engineers at {base}", STRUCTURES_CREWS)
+         for base in bases] +
+        [(f"TOOL-HEAVY-{base}", "TOOLING", f"heavy-check jacking and tooling kit at {base}", HEAVY_TOOLING_KITS)
+         for base in bases],
+        columns=["resource_id", "resource_type", "description", "capacity"])
+
+    # Calendar exceptions: structures crews off on weekends, everything closed on holidays
+    days = pd.date_range(datetime.utcnow().date(), periods=calendar_days, freq="D")
+    rows = []
+    for day in days:
+        if day.strftime("%m-%d") in HOLIDAYS:
+            rows += [(rid, day.date().isoformat(), 0) for rid in resources["resource_id"]]
+        elif day.weekday() >= 5:
+            rows += [(f"CREW-STRUCTURES-{base}", day.date().isoformat(), 0) for base in bases]
+    resource_calendar = pd.DataFrame(rows, columns=["resource_id", "calendar_date", "capacity"])
+
+    # Demand at the home base: a bay for every check, engineers for B/C checks, tooling for C checks
+    demand = []
+    for aid, base, check in zip(fleet_df["aircraft_id"], fleet_df["base"], fleet_df["check_type"]):
+        demand.append((aid, f"HANGAR-{base}", 1))
+        if check in ("B-CHECK", "C-CHECK"):
+            demand.append((aid, f"CREW-STRUCTURES-{base}", 1))
+        if check == "C-CHECK":
+            demand.append((aid, f"TOOL-HEAVY-{base}", 1))
+    resource_demand = pd.DataFrame(demand, columns=["aircraft_id", "resource_id", "quantity"])
+    return resources, resource_calendar, resource_demand
+
 if __name__ == "__main__":
     # Generate fleet and parts datasets
     df_fleet = generate_fleet()
     df_parts = generate_parts_inventory()
+    df_resources, df_calendar, df_demand = generate_resources(df_fleet)
     # Save the datasets as CSV files inside the assets directory
     df_fleet.to_csv(ASSETS_DIR / "fleet.csv", index=False)
     df_parts.to_csv(ASSETS_DIR / "parts_inventory.csv", index=False)
+    df_resources.to_csv(ASSETS_DIR / "resources.csv", index=False)
+    df_calendar.to_csv(ASSETS_DIR / "resource_calendar.csv", index=False)
+    df_demand.to_csv(ASSETS_DIR / "resource_demand.csv", index=False)
     # Notify user that files were successfully created
-    print("Generated:", ASSETS_DIR / "fleet.csv", ASSETS_DIR / "parts_inventory.csv")
+    print("Generated:", ASSETS_DIR / "fleet.csv", ASSETS_DIR / "parts_inventory.csv",
+          ASSETS_DIR / "resources.csv", ASSETS_DIR / "resource_calendar.csv", ASSETS_DIR / "resource_demand.csv")
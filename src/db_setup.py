@@ -1,21 +1,42 @@
 # db_setup.py
 from utils import execute_script
+# Tables owned by other modules are created from their own definitions
+from schedule_cache import CACHE_TABLE_SQL
+from scenario_results import SCENARIO_TABLE_SQL
+from schedule_alternatives import ALTERNATIVES_TABLE_SQL
+from solver_runs import SOLVER_RUNS_TABLE_SQL
+from ingest import INGEST_STATE_SQL
 
 # SQL schema definition for the fleet maintenance database.
 # Includes fleet data, parts inventory, and maintenance scheduling tables.
 SQL_SCRIPT = """
+-- maintenance_records is kept and still references fleet and parts_inventory: without
+-- this, dropping them fails once a schedule is saved (re-enabled at the end)
+PRAGMA foreign_keys = OFF;
+
 -- Drop existing tables to ensure a clean setup
+DROP TABLE IF EXISTS resource_demand;
+DROP TABLE IF EXISTS resource_calendar;
+DROP TABLE IF EXISTS resources;
 DROP TABLE IF EXISTS fleet;
 DROP TABLE IF EXISTS parts_inventory;
+-- Ingest state describes the dropped tables' contents
+DROP TABLE IF EXISTS ingest_files;
+DROP TABLE IF EXISTS ingest_row_hashes;
 
 -- Fleet table: stores aircraft-level operational and maintenance data
 CREATE TABLE fleet (
     aircraft_id TEXT PRIMARY KEY,                             -- Unique identifier for each aircraft
+    base TEXT,                                                -- Home maintenance base (hangar) with its own crew
     flight_hours INTEGER,                                     -- Total flight hours logged
     maint_interval_hours INTEGER,                             -- Interval (in hours) at which maintenance is required
     last_maintenance_date TEXT,                               -- Last date when maintenance was performed
     hours_since_last_maintenance INTEGER,                     -- Derived field: hours accumulated since last maintenance
-    hours_until_due INTEGER                                   -- Derived field: hours remaining until next maintenance is due
+    hours_until_due INTEGER,                                  -- Derived field: hours remaining until next maintenance is due
+    daily_utilization_hours REAL,                             -- Average flight hours per day (turns hours_until_due into a due date)
+    check_type TEXT,                                          -- Maintenance check due (A-CHECK, B-CHECK, C-CHECK)
+    maint_duration_days INTEGER,                              -- Days the check takes (fixed in the optimizer model)
+    crew_demand INTEGER                                       -- Crews the check needs at the same time
 );
 
 -- Parts inventory table: tracks availability and details of critical parts
@@ -27,6 +48,34 @@ CREATE TABLE parts_inventory (
     quantity_on_hand INTEGER                                  -- Current stock level
 );
 
+-- Resource catalog: renewable resources held for the whole maintenance (hangar bays, skilled crews, tooling)
+CREATE TABLE resources (
+    resource_id TEXT PRIMARY KEY,                             -- Unique identifier for each resource
+    resource_type TEXT,                                       -- HANGAR, CREW or TOOLING
+    description TEXT,                                         -- Description of the resource
+    capacity INTEGER NOT NULL                                 -- Units available per day, unless the calendar says otherwise
+);
+
+-- Resource calendar: per-day capacity exceptions (weekends, holidays)
+CREATE TABLE resource_calendar (
+    resource_id TEXT NOT NULL,                                -- Resource the exception applies to
+    calendar_date TEXT NOT NULL,                              -- Date (YYYY-MM-DD)
+    capacity INTEGER NOT NULL,                                -- Units available that day (0 = closed)
+    PRIMARY KEY (resource_id, calendar_date),
+    FOREIGN KEY (resource_id) REFERENCES resources(resource_id)
+);
+
+-- Resource demand: units of each resource an aircraft's maintenance holds
+CREATE TABLE resource_demand (
+    aircraft_id TEXT NOT NULL,                                -- Aircraft needing the resource
+    resource_id TEXT NOT NULL,                                -- Resource needed
+    quantity INTEGER NOT NULL,                                -- Units held for the whole maintenance
+    PRIMARY KEY (aircraft_id, resource_id),
+    FOREIGN KEY (aircraft_id) REFERENCES fleet(aircraft_id),
+    FOREIGN KEY (resource_id) REFERENCES resources(resource_id)
+);
+CREATE INDEX idx_resource_demand_resource ON resource_demand (resource_id);
+
 -- Maintenance records table: logs scheduled maintenance activities
 CREATE TABLE IF NOT EXISTS maintenance_records (
     maintenance_id INTEGER PRIMARY KEY AUTOINCREMENT,         -- Unique ID for each maintenance record
@@ -37,10 +86,28 @@ CREATE TABLE IF NOT EXISTS maintenance_records (
     part_quantity INTEGER,                                    -- Quantity of the part required
     cost REAL,                                                -- Estimated/actual cost of the maintenance
     status TEXT DEFAULT 'SCHEDULED',                          -- Status of the task (SCHEDULED, COMPLETED, etc.)
+    run_id TEXT,                                              -- Solve that wrote the record (solver_runs, schedule_alternatives); NULL after a re-plan
     -- Define relationships to enforce referential integrity
     FOREIGN KEY (aircraft_id) REFERENCES fleet(aircraft_id),
     FOREIGN KEY (part_id) REFERENCES parts_inventory(part_id)
 );
+-- Child-key indexes: reloading fleet or parts_inventory checks these references per deleted row
+CREATE INDEX IF NOT EXISTS idx_maintenance_records_aircraft ON maintenance_records (aircraft_id);
+CREATE INDEX IF NOT EXISTS idx_maintenance_records_part ON maintenance_records (part_id);
+
+-- Schedule cache: solved schedules keyed by a hash of fleet, parts and planning parameters
+""" + CACHE_TABLE_SQL + """
+-- Scenario sweep results: one row per what-if parameter set (see scenarios.py)
+""" + SCENARIO_TABLE_SQL + """
+-- Alternative schedules: near-optimal solutions of one solve (optimizer top_k), switchable in the dashboard
+""" + ALTERNATIVES_TABLE_SQL + """
+-- Solver run history: bound, gap and stop reason per solve (see solver_runs.py)
+""" + SOLVER_RUNS_TABLE_SQL + """
+-- Ingest state: checksum of the last file and hash of each row loaded per table (see ingest.py --incremental),
+-- and the change log of keys each ingest inserted or updated, for incremental downstream stages
+""" + INGEST_STATE_SQL + """
+-- Enforce foreign keys again on this (pooled) connection
+PRAGMA foreign_keys = ON;
 """
 
 if __name__ == "__main__":
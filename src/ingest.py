@@ -1,38 +1,452 @@
 # ingest.py
+import argparse
+import hashlib
+import multiprocessing
+import queue
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from utils import get_db_connection
+from utils import get_db_connection, insert_rows, insert_sql, sql_rows, table_columns
 
 # Define project root and assets directory
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 ASSETS_DIR = PROJECT_ROOT / "assets"
 
-def ingest_csv_to_table(csv_path: Path, table_name: str):
+# Generated CSVs and the tables they load into, in foreign key order
+INGEST_FILES = [
+    ("fleet.csv", "fleet"),
+    ("parts_inventory.csv", "parts_inventory"),
+    ("resources.csv", "resources"),
+    ("resource_calendar.csv", "resource_calendar"),
+    ("resource_demand.csv", "resource_demand"),
+]
+# Rows per chunk when streaming a CSV (python src/ingest.py --chunk-rows)
+INGEST_CHUNK_ROWS = 100000
+# Parsed batches the parallel pipeline buffers between the parse workers and the writer
+INGEST_QUEUE_BATCHES = 8
+# CSV column dtypes per declared SQLite column type (nullable integers, so a
+# missing value in one chunk does not turn the column into floats)
+SQLITE_CSV_DTYPES = {"INTEGER": "Int64", "REAL": "float64", "TEXT": "str"}
+# Primary key columns incremental ingest matches rows on
+INGEST_KEYS = {
+    "fleet": ["aircraft_id"],
+    "parts_inventory": ["part_id"],
+    "resources": ["resource_id"],
+    "resource_calendar": ["resource_id", "calendar_date"],
+    "resource_demand": ["aircraft_id", "resource_id"],
+}
+
+INGEST_STATE_SQL = """
+CREATE TABLE IF NOT EXISTS ingest_files (
+    table_name TEXT PRIMARY KEY,                              -- Table the file was loaded into
+    file_name TEXT NOT NULL,                                  -- CSV file name
+    checksum TEXT NOT NULL,                                   -- SHA-256 of the file contents
+    row_count INTEGER,                                        -- Rows in the file
+    ingested_at TEXT NOT NULL                                 -- When it was loaded
+);
+CREATE TABLE IF NOT EXISTS ingest_row_hashes (
+    table_name TEXT NOT NULL,                                 -- Table the row was loaded into
+    row_key TEXT NOT NULL,                                    -- Primary key values joined with "|"
+    row_hash INTEGER NOT NULL,                                -- Hash of the row as last ingested
+    PRIMARY KEY (table_name, row_key)
+);
+CREATE TABLE IF NOT EXISTS ingest_changes (
+    change_id INTEGER PRIMARY KEY AUTOINCREMENT,              -- Increasing; downstream stages keep the last one they processed
+    ingest_id TEXT NOT NULL,                                  -- Identifies one ingest
+    table_name TEXT NOT NULL,                                 -- Table that changed
+    row_key TEXT,                                             -- Changed key (NULL for a full reload)
+    change TEXT NOT NULL,                                     -- insert, update or reload
+    ingested_at TEXT NOT NULL                                 -- When the change was ingested
+);
+"""
+
+def file_checksum(csv_path: Path) -> str:
+    """
+    Returns the SHA-256 hex digest of a file, read in 1 MiB blocks.
+    """
+    hasher = hashlib.sha256()
+    with open(csv_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+def row_keys(df: pd.DataFrame, keys: list) -> pd.Series:
+    """
+    Returns each row's primary key values joined with "|" (the row_key of ingest_row_hashes).
+    """
+    row_key = df[keys[0]].astype(str)
+    for key in keys[1:]:
+        row_key = row_key + "|" + df[key].astype(str)
+    return row_key
+
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """
+    Returns a 64-bit hash of each row's values (as signed integers, which SQLite stores).
+    """
+    return pd.util.hash_pandas_object(df, index=False).to_numpy().view(np.int64)
+
+def csv_dtypes(conn, table_name: str) -> dict:
+    """
+    Returns read_csv dtypes for a table's columns from their declared SQLite types, so
+    every chunk (and every ingest) parses the same columns the same way.
+    """
+    table_columns(conn, table_name)
+    return {row[1]: SQLITE_CSV_DTYPES[row[2].upper()]
+            for row in conn.execute(f'PRAGMA table_info("{table_name}")')
+            if row[2].upper() in SQLITE_CSV_DTYPES}
+
+def _save_ingest_file(conn, table_name, csv_path, checksum, row_count, now):
+    """
+    Records the file's checksum as the table's last ingest. Runs inside the caller's transaction.
+    """
+    conn.execute(
+        "INSERT INTO ingest_files (table_name, file_name, checksum, row_count, ingested_at) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT (table_name) DO UPDATE SET file_name = excluded.file_name, checksum = excluded.checksum, "
+        "row_count = excluded.row_count, ingested_at = excluded.ingested_at",
+        (table_name, csv_path.name, checksum, row_count, now))
+
+def _save_row_hashes(conn, table_name, hashes):
+    """
+    Stores row hashes (a Series of row_hash by row_key) as last ingested. Runs inside
+    the caller's transaction.
+    """
+    conn.executemany(
+        "INSERT INTO ingest_row_hashes (table_name, row_key, row_hash) VALUES (?, ?, ?) "
+        "ON CONFLICT (table_name, row_key) DO UPDATE SET row_hash = excluded.row_hash",
+        ((table_name, key, value) for key, value in zip(hashes.index.tolist(), hashes.tolist())))
+
+def ingest_csv_to_table(csv_path: Path, table_name: str, chunk_rows: int = None):
     """
     Reads a CSV file and ingests its contents into a specified SQLite table.
-    If the table already exists, it will be replaced.
+    The table's existing rows are replaced; its db_setup schema (keys, constraints) is kept.
+    For tables in INGEST_KEYS the file checksum and row hashes are recorded, so a later
+    ingest_csv_incremental only applies what changed since.
+
+    With chunk_rows the file is streamed: read chunk_rows rows at a time with dtypes
+    taken from the table schema, each chunk written as one executemany batch, so peak
+    memory depends on the chunk size rather than the file size. The whole file is still
+    one transaction (readers never see a half-loaded table, and foreign keys are
+    checked once at the end).
 
     Args:
         csv_path (Path): Path to the CSV file containing data.
         table_name (str): Name of the database table to load the data into.
+        chunk_rows (int, optional): Rows per chunk (default: read the whole file at once)
     """
     csv_path = Path(csv_path)
     # Ensure the CSV file exists before attempting ingestion
     if not csv_path.exists():
         raise FileNotFoundError(f"{csv_path} not found")
-    # Load CSV data into a pandas DataFrame
-    df = pd.read_csv(csv_path)
-    # Establish database connection
+    started = time.perf_counter()
     conn = get_db_connection()
-    # Insert DataFrame into SQLite database
-    # if_exists="replace" ensures old data is overwritten with the new data
-    df.to_sql(table_name, conn, if_exists="replace", index=False)
-    # Close connection to free resources
+    conn.executescript(INGEST_STATE_SQL)
+    # Load CSV data with the column types the table declares
+    dtypes = csv_dtypes(conn, table_name)
+    chunks = pd.read_csv(csv_path, dtype=dtypes, chunksize=chunk_rows) if chunk_rows else \
+        [pd.read_csv(csv_path, dtype=dtypes)]
+    keys = INGEST_KEYS.get(table_name)
+    ingest_id = uuid.uuid4().hex[:12]
+    now = pd.Timestamp.now().isoformat(timespec="seconds")
+    row_count = 0
+    # Replace the table's rows and the ingest state in one transaction, keeping the table definition
+    with conn:
+        conn.execute("PRAGMA defer_foreign_keys = ON;")
+        conn.execute(f'DELETE FROM "{table_name}"')
+        conn.execute("DELETE FROM ingest_row_hashes WHERE table_name = ?", (table_name,))
+        for chunk in chunks:
+            insert_rows(conn, table_name, chunk)
+            if keys:
+                _save_row_hashes(conn, table_name,
+                                 pd.Series(row_hashes(chunk), index=row_keys(chunk, keys).to_numpy()))
+            row_count += len(chunk)
+        # Record what was loaded and tell downstream stages every row may have changed
+        _save_ingest_file(conn, table_name, csv_path, file_checksum(csv_path), row_count, now)
+        conn.execute("INSERT INTO ingest_changes (ingest_id, table_name, row_key, change, ingested_at) "
+                     "VALUES (?, ?, NULL, 'reload', ?)", (ingest_id, table_name, now))
     conn.close()
-    # Confirmation log with row count
-    print(f"Ingested {csv_path.name} -> {table_name} ({len(df)} rows)")
+    elapsed = time.perf_counter() - started
+    # Confirmation log with row count and throughput
+    print(f"Ingested {csv_path.name} -> {table_name} ({row_count} rows, {row_count / elapsed:,.0f} rows/s)")
+
+def ingest_csv_incremental(csv_path: Path, table_name: str) -> pd.DataFrame:
+    """
+    Applies only the rows of a CSV file that changed since the table's last ingest.
+
+    The file is skipped entirely when its checksum matches the last ingest. Otherwise
+    each row is hashed and compared with the hash stored for its key; new and changed
+    rows are upserted (INSERT ... ON CONFLICT DO UPDATE on the INGEST_KEYS columns)
+    and logged in ingest_changes, all in one transaction. A key no earlier ingest
+    loaded is logged as an insert. Keys missing from the file are left in the table.
+
+    Args:
+        csv_path (Path): Path to the CSV file containing data.
+        table_name (str): Name of the database table (must be in INGEST_KEYS).
+
+    Returns:
+        pd.DataFrame: row_key and change (insert or update) per applied row; empty
+                      when nothing changed.
+    """
+    csv_path = Path(csv_path)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"{csv_path} not found")
+    if table_name not in INGEST_KEYS:
+        raise ValueError(f"No key columns known for table {table_name} (see INGEST_KEYS)")
+    keys = INGEST_KEYS[table_name]
+    changes = pd.DataFrame(columns=["row_key", "change"])
+
+    checksum = file_checksum(csv_path)
+    conn = get_db_connection()
+    conn.executescript(INGEST_STATE_SQL)
+    last = conn.execute("SELECT checksum FROM ingest_files WHERE table_name = ?", (table_name,)).fetchone()
+    if last is not None and last[0] == checksum:
+        conn.close()
+        print(f"Skipped {csv_path.name} -> {table_name} (unchanged since last ingest)")
+        return changes
+
+    df = pd.read_csv(csv_path, dtype=csv_dtypes(conn, table_name))
+    key_series = row_keys(df, keys)
+    if key_series.duplicated().any():
+        conn.close()
+        raise ValueError(f"{csv_path.name} has duplicate {', '.join(keys)} values")
+    hashes = pd.Series(row_hashes(df), index=key_series.to_numpy())
+    stored = pd.read_sql_query("SELECT row_key, row_hash FROM ingest_row_hashes WHERE table_name = ?",
+                               conn, params=(table_name,)).set_index("row_key")["row_hash"]
+    # Nullable integers: a float NaN for new keys would round the 64-bit hashes
+    previous = stored.astype("Int64").reindex(hashes.index)
+    pending = previous.ne(hashes).fillna(True).to_numpy(dtype=bool)
+
+    # Keys an earlier ingest loaded are updates, the rest inserts
+    changes = pd.DataFrame({"row_key": hashes.index[pending],
+                            "change": np.where(previous[pending].notna(), "update", "insert")})
+
+    columns = ", ".join(f'"{col}"' for col in df.columns)
+    placeholders = ", ".join("?" for _ in df.columns)
+    updates = ", ".join(f'"{col}" = excluded."{col}"' for col in df.columns if col not in keys)
+    key_columns = ", ".join(f'"{key}"' for key in keys)
+    upsert = (f'INSERT INTO "{table_name}" ({columns}) VALUES ({placeholders}) '
+              f'ON CONFLICT ({key_columns}) DO ' + (f"UPDATE SET {updates}" if updates else "NOTHING"))
+    ingest_id = uuid.uuid4().hex[:12]
+    now = pd.Timestamp.now().isoformat(timespec="seconds")
+    with conn:
+        conn.execute("PRAGMA defer_foreign_keys = ON;")
+        conn.executemany(upsert, sql_rows(df[pending]))
+        _save_row_hashes(conn, table_name, hashes[pending])
+        _save_ingest_file(conn, table_name, csv_path, checksum, len(df), now)
+        conn.executemany(
+            "INSERT INTO ingest_changes (ingest_id, table_name, row_key, change, ingested_at) VALUES (?, ?, ?, ?, ?)",
+            ((ingest_id, table_name, key, change, now) for key, change in zip(changes["row_key"], changes["change"])))
+    conn.close()
+
+    counts = changes["change"].value_counts()
+    print(f"Ingested {csv_path.name} -> {table_name} incrementally ({counts.get('insert', 0)} inserted, "
+          f"{counts.get('update', 0)} updated, {len(df) - len(changes)} unchanged)")
+    return changes
+
+def discover_ingest_files(directory: Path = ASSETS_DIR) -> list:
+    """
+    Finds the CSVs to ingest in a directory: for each INGEST_FILES entry, the file itself
+    and per-station files named like it with a suffix (fleet.csv, fleet_LAX.csv, ...).
+
+    Returns:
+        list: (csv_path, table_name) pairs in INGEST_FILES order
+    """
+    directory = Path(directory)
+    files = []
+    for file_name, table_name in INGEST_FILES:
+        stem = Path(file_name).stem
+        files += [(path, table_name) for path in sorted(directory.glob(f"{stem}*.csv"))
+                  if path.stem == stem or path.stem[len(stem):].startswith("_")]
+    return files
+
+# Queue shared with the parse workers (set by _init_parse_worker)
+_batches = None
+
+def _init_parse_worker(batches):
+    global _batches
+    _batches = batches
+
+def _parse_file(index, csv_path, table_name, dtypes, columns, keys, chunk_rows):
+    """
+    Process-pool worker: reads one CSV in chunks, validates each chunk against the
+    table (known columns, key columns present, non-null and unique within the file),
+    and puts ("batch", index, rows, hashes) on the queue, where rows are ready for
+    executemany and hashes is the chunk's row hashes by key (None for unkeyed tables).
+    Ends with ("done", index, row_count, seconds) or ("error", index, message).
+    """
+    started = time.perf_counter()
+    row_count = 0
+    seen = set()
+    try:
+        for chunk in pd.read_csv(csv_path, dtype=dtypes, chunksize=chunk_rows):
+            unknown = [col for col in chunk.columns if col not in columns]
+            if unknown:
+                raise ValueError(f"columns {unknown} are not in table {table_name}")
+            hashes = None
+            if keys:
+                missing = [key for key in keys if key not in chunk.columns]
+                if missing:
+                    raise ValueError(f"key columns {missing} missing")
+                if chunk[keys].isna().any(axis=None):
+                    raise ValueError(f"empty {', '.join(keys)} values")
+                chunk_keys = row_keys(chunk, keys)
+                if chunk_keys.duplicated().any() or not seen.isdisjoint(chunk_keys):
+                    raise ValueError(f"duplicate {', '.join(keys)} values")
+                seen.update(chunk_keys)
+                hashes = pd.Series(row_hashes(chunk), index=chunk_keys.to_numpy())
+            _batches.put(("batch", index, (list(chunk.columns), list(sql_rows(chunk))), hashes))
+            row_count += len(chunk)
+        _batches.put(("done", index, row_count, time.perf_counter() - started))
+    except Exception as e:
+        _batches.put(("error", index, f"{type(e).__name__}: {e}"))
+
+def ingest_files_parallel(files: list, max_workers: int = None, chunk_rows: int = INGEST_CHUNK_ROWS,
+                          queue_batches: int = INGEST_QUEUE_BATCHES) -> pd.DataFrame:
+    """
+    Ingests many CSVs at once: a process pool parses and validates the files in
+    chunk_rows chunks, and the calling process is the single writer, inserting the
+    parsed batches from a bounded queue through one connection. Every target table
+    is replaced by the union of its files in one transaction, so an invalid file,
+    or a key repeated across files, loads nothing.
+
+    Args:
+        files (list): (csv_path, table_name) pairs (see discover_ingest_files); several
+                      files may load into the same table
+        max_workers (int, optional): Parse processes (default: one per CPU)
+        chunk_rows (int): Rows per parsed batch
+        queue_batches (int): Batches buffered between the parsers and the writer
+
+    Returns:
+        pd.DataFrame: Per file: table, rows, parse_seconds, parse_rows_per_s and
+                      written_at (seconds from the start until its last batch was written).
+                      attrs holds wall_seconds and rows_per_s for the whole load.
+    """
+    files = [(Path(path), table_name) for path, table_name in files]
+    for path, _ in files:
+        if not path.exists():
+            raise FileNotFoundError(f"{path} not found")
+    started = time.perf_counter()
+    conn = get_db_connection()
+    conn.executescript(INGEST_STATE_SQL)
+    tables = list(dict.fromkeys(table_name for _, table_name in files))
+    columns = {table_name: table_columns(conn, table_name) for table_name in tables}
+    dtypes = {table_name: csv_dtypes(conn, table_name) for table_name in tables}
+
+    stats = pd.DataFrame({"file": [path.name for path, _ in files], "table": [t for _, t in files],
+                          "rows": 0, "parse_seconds": float("nan"), "written_at": float("nan")})
+    errors = {}
+    batches = multiprocessing.Queue(maxsize=queue_batches)
+    ingest_id = uuid.uuid4().hex[:12]
+    now = pd.Timestamp.now().isoformat(timespec="seconds")
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_parse_worker,
+                             initargs=(batches,)) as pool:
+        futures = [pool.submit(_parse_file, index, str(path), table_name, dtypes[table_name],
+                               columns[table_name], INGEST_KEYS.get(table_name), chunk_rows)
+                   for index, (path, table_name) in enumerate(files)]
+        pending = len(files)
+        try:
+            with conn:
+                conn.execute("PRAGMA defer_foreign_keys = ON;")
+                for table_name in tables:
+                    conn.execute(f'DELETE FROM "{table_name}"')
+                    conn.execute("DELETE FROM ingest_row_hashes WHERE table_name = ?", (table_name,))
+                while pending:
+                    try:
+                        message = batches.get(timeout=1.0)
+                    except queue.Empty:
+                        # A worker that died without reporting would otherwise block the writer forever
+                        for future in futures:
+                            if future.done() and future.exception() is not None:
+                                raise future.exception()
+                        continue
+                    kind, index = message[0], message[1]
+                    table_name = files[index][1]
+                    if kind == "batch":
+                        (batch_columns, rows), hashes = message[2], message[3]
+                        conn.executemany(insert_sql(table_name, batch_columns), rows)
+                        if hashes is not None:
+                            _save_row_hashes(conn, table_name, hashes)
+                        stats.loc[index, "rows"] += len(rows)
+                        continue
+                    pending -= 1
+                    if kind == "error":
+                        errors[files[index][0].name] = message[2]
+                    else:
+                        stats.loc[index, "parse_seconds"] = message[3]
+                        stats.loc[index, "written_at"] = time.perf_counter() - started
+                if errors:
+                    raise ValueError("Invalid ingest files, nothing loaded: " +
+                                     "; ".join(f"{name}: {error}" for name, error in errors.items()))
+                for table_name in tables:
+                    table_files = [path for path, t in files if t == table_name]
+                    if len(table_files) == 1:
+                        row_count = int(stats.loc[stats["table"] == table_name, "rows"].sum())
+                        _save_ingest_file(conn, table_name, table_files[0], file_checksum(table_files[0]),
+                                          row_count, now)
+                    else:
+                        # No single file to compare an incremental ingest against
+                        conn.execute("DELETE FROM ingest_files WHERE table_name = ?", (table_name,))
+                    conn.execute("INSERT INTO ingest_changes (ingest_id, table_name, row_key, change, ingested_at) "
+                                 "VALUES (?, ?, NULL, 'reload', ?)", (ingest_id, table_name, now))
+        except BaseException:
+            # Drain the queue so blocked workers can finish and the pool can shut down
+            for future in futures:
+                future.cancel()
+            while not all(future.done() for future in futures):
+                try:
+                    batches.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            raise
+        finally:
+            conn.close()
+
+    wall = time.perf_counter() - started
+    stats["parse_rows_per_s"] = stats["rows"] / stats["parse_seconds"]
+    stats.attrs = {"wall_seconds": wall, "rows_per_s": stats["rows"].sum() / wall}
+    for row in stats.itertuples():
+        print(f"  {row.file} -> {row.table}: {row.rows} rows, parsed in {row.parse_seconds:.2f}s "
+              f"({row.parse_rows_per_s:,.0f} rows/s), written by {row.written_at:.2f}s")
+    print(f"Ingested {len(files)} files ({stats['rows'].sum()} rows) in {wall:.2f}s "
+          f"({stats.attrs['rows_per_s']:,.0f} rows/s)")
+    return stats
+
+def load_ingest_changes(since_change_id: int = 0, table_name: str = None) -> pd.DataFrame:
+    """
+    Returns the ingest_changes rows after since_change_id (optionally for one table),
+    oldest first, so a downstream stage can process only what changed since its last run.
+    """
+    conn = get_db_connection()
+    conn.executescript(INGEST_STATE_SQL)
+    query = "SELECT * FROM ingest_changes WHERE change_id > ?"
+    params = [since_change_id]
+    if table_name is not None:
+        query += " AND table_name = ?"
+        params.append(table_name)
+    changes = pd.read_sql_query(query + " ORDER BY change_id", conn, params=params)
+    conn.close()
+    return changes
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load the generated CSVs from assets/ into the database")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only apply rows that changed since the last ingest (skip unchanged files)")
+    parser.add_argument("--chunk-rows", type=int, nargs="?", const=INGEST_CHUNK_ROWS, default=None,
+                        help=f"Stream full ingests in chunks of this many rows (default {INGEST_CHUNK_ROWS})")
+    parser.add_argument("--parallel", action="store_true",
+                        help="Parse every CSV in assets/ (including per-station files such as fleet_LAX.csv) "
+                             "in a process pool and write them through one connection")
+    parser.add_argument("--workers", type=int, default=None, help="Parse processes for --parallel (default: one per CPU)")
+    args = parser.parse_args()
+
     # Ingest generated CSVs into the database
-    ingest_csv_to_table(ASSETS_DIR / "fleet.csv", "fleet")
-    ingest_csv_to_table(ASSETS_DIR / "parts_inventory.csv", "parts_inventory")
+    if args.parallel:
+        ingest_files_parallel(discover_ingest_files(ASSETS_DIR), args.workers, args.chunk_rows or INGEST_CHUNK_ROWS)
+    else:
+        for file_name, table_name in INGEST_FILES:
+            if args.incremental:
+                ingest_csv_incremental(ASSETS_DIR / file_name, table_name)
+            else:
+                ingest_csv_to_table(ASSETS_DIR / file_name, table_name, args.chunk_rows)
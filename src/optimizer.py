@@ -1,15 +1,59 @@
 # optimizer.py
+import numpy as np
 import pandas as pd
 from ortools.sat.python import cp_model
-from utils import get_db_connection
+from utils import bulk_load_table, get_db_connection, table_columns
+from schedule_cache import schedule_cache_key, get_cached_schedule, store_schedule
+from solver_runs import record_solver_run
+from schedule_alternatives import save_alternatives_to_db
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
-import random
+import argparse
+import heapq
+import time
 
 # Planning parameters (tunable)
 PLANNING_HORIZON_DAYS = 30    # Number of days to plan ahead
 MAINT_DURATION_MIN = 1        # Minimum maintenance duration (days)
 MAINT_DURATION_MAX = 2        # Maximum maintenance duration (days)
 CREW_AVAILABLE = 2            # Limits how many aircraft can be in maintenance same day
+MODEL_FORMULATION = "interval"  # "interval" (scales with aircraft) or "daily" (scales with aircraft x days)
+SOLVER_SEED = 0               # CP-SAT random seed (part of the schedule cache key)
+SOLVER_TIME_LIMIT = 30.0      # CP-SAT time limit per solve (seconds)
+SOLVER_WORKERS = 8            # CP-SAT search workers
+SOLVER_INTERLEAVE_SEARCH = False  # Interleave workers' search in batches (deterministic with several workers)
+SOLVER_PRESOLVE_LEVEL = 2     # 0 = no presolve, 1 = a single presolve pass, 2 = full presolve
+SOLVER_LOG_SEARCH = False     # Print CP-SAT search progress
+SOLVER_DETERMINISTIC = False  # Bit-identical results for identical inputs (see SolverConfig)
+SOLVER_RELATIVE_GAP_LIMIT = 0.0  # Stop once (objective - bound) / objective is at most this (0 = prove optimality)
+SOLVER_WALL_TIME_BUDGET = None  # Wall-clock budget for a whole solve incl. model build (seconds, None = no budget)
+PARTS_ALLOCATION_SEED = 0     # Seed for the random part quantities drawn at allocation
+CREW_BY_BASE = {}             # Crew per maintenance base; bases not listed get CREW_AVAILABLE
+SCHEDULER_ENGINE = "cpsat"    # "cpsat" (optimal model), "greedy" (sub-second list scheduling) or "lns"
+GREEDY_FALLBACK = True        # Return the greedy plan when CP-SAT finds no solution in time
+OBJECTIVE_MODE = "weighted_start"  # "weighted_start" (sum start_day x weight) or "tardiness" (see due_days)
+HARD_DUE_DATES = False        # Tardiness mode: every aircraft must start by its due day (overdue ones on day 0)
+TARDINESS_PENALTY = 100       # Tardiness mode: cost of one weighted day late, in weighted start days
+DEFAULT_DAILY_UTILIZATION_HOURS = 10.0  # Flight hours per day for fleets without daily_utilization_hours
+RECORD_SOLVER_RUNS = False    # Log library solves to the solver_runs table (main() always logs its solve)
+ALTERNATIVES_TIME_LIMIT = 10.0  # Solver time limit per alternative schedule (seconds)
+ALTERNATIVES_MIN_CHANGES = 1  # Aircraft whose start day must differ from every earlier alternative
+
+# Rolling-horizon parameters (see generate_schedule_rolling)
+ROLLING_TOTAL_DAYS = 365      # Total number of days to plan in rolling mode
+ROLLING_COMMIT_DAYS = 14      # Days frozen from each window before sliding forward
+ROLLING_WINDOW_TIME_LIMIT = 10.0  # Solver time limit per window (seconds)
+
+# Large neighbourhood search (engine="lns")
+LNS_NEIGHBOURHOOD_SIZE = 500  # Aircraft relaxed per neighbourhood
+LNS_ITERATIONS = 50           # Maximum LNS iterations
+LNS_PARALLEL_NEIGHBOURHOODS = 4  # Neighbourhoods solved concurrently, one worker process each
+LNS_STRATEGIES = ("window", "urgency", "random")  # Neighbourhood selection, cycled per neighbourhood
+LNS_SUBSOLVE_TIME_LIMIT = 2.0  # Solver time limit per neighbourhood (seconds)
+LNS_INITIAL_TIME_LIMIT = 10.0  # Time limit for the full-model solve giving the first incumbent
+LNS_TIME_LIMIT = 60.0         # Wall-clock budget for the whole search (seconds)
+LNS_MAX_STALL = 10            # Stop after this many iterations without improvement
 
 # Load fleet and parts data
 def load_data():
@@ -25,34 +69,132 @@ def load_data():
     conn.close()
     return fleet_df, parts_df
 
-# Generate optimized maintenance schedule
-def generate_schedule(fleet_df, parts_df):
+# Load the previously saved schedule (used for warm starts)
+def load_previous_schedule():
     """
-    Creates a maintenance schedule using OR-Tools CP-SAT solver.
-    The schedule respects crew availability, urgency (hours until maintenance due),
-    and available parts.
-    
+    Retrieves the schedule persisted by the last save_schedule_to_db call.
+    Returns:
+        previous_df (DataFrame): aircraft_id, schedule_start, schedule_end rows;
+            empty if no schedule has been saved yet
+    """
+    conn = get_db_connection()
+    try:
+        previous_df = pd.read_sql_query(
+            "SELECT aircraft_id, schedule_start, schedule_end FROM maintenance_records", conn)
+    except pd.errors.DatabaseError:
+        previous_df = pd.DataFrame(columns=["aircraft_id", "schedule_start", "schedule_end"])
+    conn.close()
+    return previous_df
+
+# Load renewable resources (hangar bays, skilled crews, tooling)
+def load_resources():
+    """
+    Retrieves the resource catalog, its capacity calendar and per-aircraft demand.
+    Returns:
+        resources (dict or None): {"catalog", "calendar", "demand"} DataFrames;
+            None when no resources are defined
+    """
+    conn = get_db_connection()
+    try:
+        resources = {
+            "catalog": pd.read_sql_query("SELECT * FROM resources", conn),
+            "calendar": pd.read_sql_query("SELECT * FROM resource_calendar", conn),
+            "demand": pd.read_sql_query("SELECT * FROM resource_demand", conn),
+        }
+    except pd.errors.DatabaseError:
+        resources = None
+    conn.close()
+    if resources is None or resources["catalog"].empty:
+        return None
+    return resources
+
+# Per-aircraft maintenance requirements
+def maintenance_requirements(fleet_df):
+    """
+    Reads fixed maintenance durations and crew demand from the fleet data
+    (maint_duration_days and crew_demand columns, e.g. derived from check type).
+
+    Returns:
+        durations (dict or None): aircraft_id -> duration in days; None when the
+            fleet has no durations and they stay free between MAINT_DURATION_MIN and MAX
+        demands (dict or None): aircraft_id -> crews needed; None means one crew each
+    """
+    aircraft_ids = fleet_df["aircraft_id"].tolist()
+    durations = None
+    demands = None
+    if "maint_duration_days" in fleet_df.columns:
+        durations = dict(zip(aircraft_ids, fleet_df["maint_duration_days"].astype(int).tolist()))
+    if "crew_demand" in fleet_df.columns:
+        demands = dict(zip(aircraft_ids, fleet_df["crew_demand"].astype(int).tolist()))
+        if demands and max(demands.values()) > CREW_AVAILABLE:
+            raise ValueError(f"An aircraft needs {max(demands.values())} crews but only "
+                             f"{CREW_AVAILABLE} are available")
+    return durations, demands
+
+def requirement_groups(aircraft_list, durations, demands, signatures=None):
+    """
+    Groups aircraft by (duration, crew demand, resource demand). Only aircraft
+    within one group can swap intervals, so urgency ordering is applied per group.
+
     Args:
-        fleet_df (DataFrame): Fleet information
-        parts_df (DataFrame): Parts inventory information
-    
+        signatures (dict, optional): aircraft_id -> resource demand signature
+            (see resource_signatures)
+
     Returns:
-        df_schedule (DataFrame): Scheduled maintenance for each aircraft
+        dict: (duration or None, demand, signature) -> list of aircraft_id
     """
-    model = cp_model.CpModel()
-    horizon = PLANNING_HORIZON_DAYS
+    groups = {}
+    for aid in aircraft_list:
+        key = (durations[aid] if durations else None, demands[aid] if demands else 1,
+               signatures.get(aid, ()) if signatures else ())
+        groups.setdefault(key, []).append(aid)
+    return groups
 
-    # List of all aircraft IDs
-    aircraft_list = fleet_df["aircraft_id"].tolist()
+def new_maintenance_interval(model, aid, latest_start, fixed_duration=None):
+    """
+    Adds one aircraft's start variable and maintenance interval, starting between
+    day 0 and latest_start. With fixed_duration the interval has a fixed size;
+    otherwise the duration is free between MAINT_DURATION_MIN and MAINT_DURATION_MAX.
 
-    # Decision variables
+    Returns:
+        tuple: (start IntVar, duration IntVar, IntervalVar)
+    """
+    start = model.NewIntVar(0, latest_start, f"start_{aid}")
+    if fixed_duration is not None:
+        duration = model.NewConstant(int(fixed_duration))
+        return start, duration, model.NewFixedSizeIntervalVar(start, int(fixed_duration), f"maint_{aid}")
+    duration = model.NewIntVar(MAINT_DURATION_MIN, MAINT_DURATION_MAX, f"dur_{aid}")
+    end = model.NewIntVar(MAINT_DURATION_MIN, latest_start + MAINT_DURATION_MAX, f"end_{aid}")
+    return start, duration, model.NewIntervalVar(start, duration, end, f"maint_{aid}")
+
+# Daily boolean formulation
+def build_daily_model(model, aircraft_list, horizon, durations=None, demands=None):
+    """
+    Adds one BoolVar per aircraft per day, linked to start_day/duration through
+    reified "before/after" literals, and caps the daily crew demand at CREW_AVAILABLE.
+    Model size grows as 3 x aircraft x days.
+
+    Args:
+        model (CpModel): Model to populate
+        aircraft_list (list): Aircraft IDs to schedule
+        horizon (int): Number of days in the planning window
+        durations (dict, optional): aircraft_id -> fixed duration (see maintenance_requirements)
+        demands (dict, optional): aircraft_id -> crews needed (default 1)
+
+    Returns:
+        start_day (dict): aircraft_id -> IntVar start day
+        duration (dict): aircraft_id -> IntVar maintenance duration
+    """
     start_day = {}            # start day of maintenance per aircraft
     duration = {}             # maintenance duration per aircraft
     is_scheduled_on_day = {}  # boolean matrix: (aircraft, day) -> scheduled or not
 
     for aid in aircraft_list:
         start_day[aid] = model.NewIntVar(0, horizon - 1, f"start_{aid}")
-        duration[aid] = model.NewIntVar(MAINT_DURATION_MIN, MAINT_DURATION_MAX, f"dur_{aid}")
+        if durations:
+            duration[aid] = model.NewIntVar(durations[aid], durations[aid], f"dur_{aid}")
+        else:
+            duration[aid] = model.NewIntVar(MAINT_DURATION_MIN, MAINT_DURATION_MAX, f"dur_{aid}")
         for d in range(horizon):
             is_scheduled_on_day[(aid, d)] = model.NewBoolVar(f"on_{aid}_d{d}")
 
@@ -74,106 +216,1857 @@ def generate_schedule(fleet_df, parts_df):
             model.AddBoolOr([before.Not(), after.Not()]).OnlyEnforceIf(is_scheduled_on_day[(aid, d)].Not())
 
     # Capacity constraint
-    # Ensures no more aircraft are in maintenance than crew available on any day
+    # Ensures aircraft in maintenance need no more crews than available on any day
     for d in range(horizon):
-        model.Add(sum(is_scheduled_on_day[(aid, d)] for aid in aircraft_list) <= CREW_AVAILABLE)
-
-    # Build a weighted objective that pushes urgent aircraft earlier:
-    # urgency = smaller hours_until_due => higher weight
-    max_hours = int(fleet_df["hours_until_due"].max()) if len(fleet_df) else 1
-    weights = {}
-    for _, row in fleet_df.iterrows():
-        aid = row["aircraft_id"]
-        # weight proportional to (max_hours - hours_until_due)
-        urgency = int(row["hours_until_due"])
-        # Normalize to [1..100]
-        weight = max(1, int(((max_hours - urgency) / max_hours) * 100))
-        weights[aid] = weight
-
-    # Objective: minimize weighted sum of start days
-    model.Minimize(sum(start_day[aid] * weights[aid] for aid in aircraft_list))
+        model.Add(sum(is_scheduled_on_day[(aid, d)] * (demands[aid] if demands else 1)
+                      for aid in aircraft_list) <= CREW_AVAILABLE)
+
+    return start_day, duration
+
+# Interval formulation
+def build_interval_model(model, aircraft_list, horizon, durations=None, demands=None):
+    """
+    Adds one interval variable per aircraft and a single AddCumulative constraint
+    for crew capacity. Model size grows linearly in aircraft, independent of days.
+    With per-aircraft durations the intervals have a fixed size, leaving only
+    start days to search.
+
+    Maintenance that starts near the end of the window may run past it; unlike the
+    daily formulation, those overflow days still count against crew capacity.
+
+    Args:
+        model (CpModel): Model to populate
+        aircraft_list (list): Aircraft IDs to schedule
+        horizon (int): Number of days in the planning window
+        durations (dict, optional): aircraft_id -> fixed duration (see maintenance_requirements)
+        demands (dict, optional): aircraft_id -> crews needed (default 1)
+
+    Returns:
+        start_day (dict): aircraft_id -> IntVar start day
+        duration (dict): aircraft_id -> IntVar maintenance duration
+    """
+    start_day = {}
+    duration = {}
+    intervals = []
+
+    for aid in aircraft_list:
+        start_day[aid], duration[aid], interval = new_maintenance_interval(
+            model, aid, horizon - 1, durations[aid] if durations else None)
+        intervals.append(interval)
+
+    # Capacity constraint: each aircraft in maintenance occupies its crews
+    model.AddCumulative(intervals, [demands[aid] for aid in aircraft_list] if demands else [1] * len(intervals),
+                        CREW_AVAILABLE)
+
+    return start_day, duration
+
+# Symmetry breaking for interchangeable aircraft
+def add_urgency_ordering(model, start_day, weights, latest_start=None, crew=None):
+    """
+    Forces more urgent aircraft to start no later than less urgent ones and adds
+    the implied lower bound on each start day (the k-th aircraft in urgency order
+    cannot start before day k // crew).
+
+    Only valid when every aircraft has the same start/duration domain and crew
+    demand, since it relies on swapping two aircraft's intervals (see
+    requirement_groups). For aircraft needing several crews, pass
+    crew=CREW_AVAILABLE // demand.
+
+    Args:
+        model (CpModel): Model to populate
+        start_day (dict): aircraft_id -> IntVar start day
+        weights (dict): aircraft_id -> objective weight
+        latest_start (int, optional): Caps the implied lower bounds, for models where
+            start_day == latest_start marks a deferred aircraft
+        crew (int, optional): Daily crew capacity (default CREW_AVAILABLE)
+    """
+    if crew is None:
+        crew = CREW_AVAILABLE
+    if crew < 1:
+        raise ValueError(f"Urgency ordering needs at least one crew per aircraft (crew={crew})")
+    order = sorted(start_day, key=lambda aid: -weights[aid])
+    for rank, aid in enumerate(order):
+        lower = rank // crew
+        if latest_start is not None:
+            lower = min(lower, latest_start)
+        model.Add(start_day[aid] >= lower)
+    for earlier, later in zip(order, order[1:]):
+        model.Add(start_day[earlier] <= start_day[later])
+
+# Part demand that exceeds stock
+def short_part_demand(aircraft_list, part_ids, quantities, parts_df):
+    """
+    Returns the demand rows (aircraft_id, part_id, quantity) for parts whose total
+    demand exceeds quantity_on_hand; only these can delay maintenance.
+    """
+    demand = pd.DataFrame({"aircraft_id": aircraft_list, "part_id": part_ids, "quantity": quantities})
+    demand = demand.dropna(subset=["part_id"])
+    totals = demand.groupby("part_id")["quantity"].sum()
+    on_hand = parts_df.set_index("part_id").loc[totals.index, "quantity_on_hand"].to_numpy()
+    short_parts = totals.index[totals.to_numpy() > on_hand]
+    return demand[demand["part_id"].isin(short_parts)]
+
+# Parts availability and lead times inside the model
+def add_parts_constraints(model, start_day, aircraft_list, part_ids, quantities, parts_df):
+    """
+    Constrains start days by part availability. For each part whose total demand
+    exceeds quantity_on_hand, every demanding aircraft gets one "served from stock"
+    literal: stock-served quantities must fit in quantity_on_hand, and the rest wait
+    for the replenishment order, i.e. start no earlier than lead_time_days.
+    Parts with enough stock add nothing, so the model grows with the number of
+    aircraft on short parts, not with parts x days.
+
+    Args:
+        model (CpModel): Model to populate
+        start_day (dict): aircraft_id -> IntVar start day
+        aircraft_list (list): Aircraft IDs, aligned with part_ids/quantities
+        part_ids (ndarray): Demanded part_id per aircraft (None for no part)
+        quantities (ndarray): Demanded units per aircraft
+        parts_df (DataFrame): Parts inventory information
+
+    Returns:
+        groups (list): Lists of aircraft that remain interchangeable under these
+            constraints (safe for add_urgency_ordering within each list)
+        parts_stats (dict): Short parts and aircraft exposed to backorders
+    """
+    short = short_part_demand(aircraft_list, part_ids, quantities, parts_df)
+    short_parts = short["part_id"].unique()
+    stock = parts_df.set_index("part_id")
+    for part_id, rows in short.groupby("part_id"):
+        on_hand = int(stock.at[part_id, "quantity_on_hand"])
+        lead_time = int(stock.at[part_id, "lead_time_days"])
+        from_stock = []
+        for aid, qty in zip(rows["aircraft_id"], rows["quantity"]):
+            served = model.NewBoolVar(f"stock_{aid}")
+            model.Add(start_day[aid] >= lead_time).OnlyEnforceIf(served.Not())
+            from_stock.append(served * int(qty))
+        model.Add(sum(from_stock) <= on_hand)
+
+    # Aircraft on the same short part with the same quantity can swap places,
+    # as can all aircraft whose part is not short
+    short_ids = set(short["aircraft_id"])
+    groups = [[aid for aid in aircraft_list if aid not in short_ids]]
+    groups += [rows["aircraft_id"].tolist() for _, rows in short.groupby(["part_id", "quantity"])]
+    parts_stats = {"short_parts": len(short_parts), "aircraft_on_short_parts": len(short)}
+    return groups, parts_stats
+
+# Earliest start days implied by part stock
+def parts_release_days(aircraft_list, part_ids, quantities, parts_df, weights):
+    """
+    Serves short parts from stock in urgency order while it lasts; aircraft left
+    without stock must wait for the part's lead_time_days. Gives a plan that
+    satisfies add_parts_constraints when used as greedy_schedule release days.
+
+    Returns:
+        dict: aircraft_id -> earliest start day (only aircraft that must wait)
+    """
+    short = short_part_demand(aircraft_list, part_ids, quantities, parts_df)
+    stock = parts_df.set_index("part_id")
+    release = {}
+    for part_id, rows in short.groupby("part_id"):
+        on_hand = int(stock.at[part_id, "quantity_on_hand"])
+        lead_time = int(stock.at[part_id, "lead_time_days"])
+        for aid, qty in sorted(zip(rows["aircraft_id"], rows["quantity"]), key=lambda r: -weights[r[0]]):
+            if qty <= on_hand:
+                on_hand -= int(qty)
+            else:
+                release[aid] = lead_time
+    return release
+
+# Per-day resource capacity
+def resource_capacity(resources, num_days):
+    """
+    Expands each resource's default capacity and its calendar exceptions
+    (weekends, holidays) into units available per day offset from today.
+
+    Args:
+        resources (dict): {"catalog", "calendar", "demand"} (see load_resources)
+        num_days (int): Number of day offsets to cover
+
+    Returns:
+        resource_ids (list): Resource IDs in catalog order
+        capacity (ndarray): resources x num_days units available
+    """
+    catalog = resources["catalog"]
+    resource_ids = catalog["resource_id"].tolist()
+    capacity = np.repeat(catalog["capacity"].to_numpy(dtype=np.int64)[:, None], num_days, axis=1)
+    calendar = resources["calendar"]
+    if not calendar.empty:
+        offsets = (pd.to_datetime(calendar["calendar_date"]) - pd.Timestamp.now().normalize()).dt.days.to_numpy()
+        rows = pd.Index(resource_ids).get_indexer(calendar["resource_id"])
+        keep = (offsets >= 0) & (offsets < num_days) & (rows >= 0)
+        capacity[rows[keep], offsets[keep]] = calendar["capacity"].to_numpy(dtype=np.int64)[keep]
+    return resource_ids, capacity
+
+def resource_signatures(aircraft_list, resources):
+    """
+    Returns aircraft_id -> ((resource_id, quantity), ...) for aircraft that demand
+    resources; aircraft with equal signatures compete for the same resources.
+    """
+    demand = resources["demand"]
+    demand = demand[demand["aircraft_id"].isin(set(aircraft_list))].sort_values(["aircraft_id", "resource_id"])
+    return {aid: tuple(zip(rows["resource_id"], rows["quantity"].astype(int)))
+            for aid, rows in demand.groupby("aircraft_id", sort=False)}
+
+# Renewable resources with capacity calendars
+def add_resource_constraints(model, start_day, duration, durations, resources, num_days):
+    """
+    Adds one AddCumulative per resource over the aircraft that demand it. Days
+    with less than the resource's peak capacity are held by fixed "closure"
+    intervals (one per run of equal days), so calendars need no per-day booleans
+    and the model grows with aircraft x resources demanded, not with days.
+
+    Args:
+        model (CpModel): Model to populate
+        start_day (dict): aircraft_id -> IntVar start day
+        duration (dict): aircraft_id -> IntVar maintenance duration
+        durations (dict or None): aircraft_id -> fixed duration (see maintenance_requirements)
+        resources (dict): {"catalog", "calendar", "demand"} (see load_resources)
+        num_days (int): Days covered by the calendar, including overflow past the horizon
+
+    Returns:
+        resource_stats (dict): Constrained resources and closure intervals
+    """
+    resource_ids, capacity = resource_capacity(resources, num_days)
+    demand = resources["demand"]
+    demand = demand[demand["aircraft_id"].isin(set(start_day))]
+
+    # One interval per aircraft, shared by every resource it needs
+    intervals = {}
+    for aid in demand["aircraft_id"].unique():
+        if durations:
+            intervals[aid] = model.NewFixedSizeIntervalVar(start_day[aid], durations[aid], f"res_{aid}")
+        else:
+            intervals[aid] = model.NewIntervalVar(
+                start_day[aid], duration[aid], start_day[aid] + duration[aid], f"res_{aid}")
+
+    by_resource = dict(list(demand.groupby("resource_id")))
+    constrained = 0
+    closures = 0
+    for rid, cap in zip(resource_ids, capacity):
+        if rid not in by_resource:
+            continue
+        rows = by_resource[rid]
+        peak = int(cap.max())
+        res_intervals = [intervals[aid] for aid in rows["aircraft_id"]]
+        res_demands = rows["quantity"].astype(int).tolist()
+        missing = peak - cap
+        day = 0
+        while day < num_days:
+            end = day
+            while end < num_days and missing[end] == missing[day]:
+                end += 1
+            if missing[day]:
+                res_intervals.append(model.NewFixedSizeIntervalVar(day, end - day, f"closed_{rid}_d{day}"))
+                res_demands.append(int(missing[day]))
+                closures += 1
+            day = end
+        model.AddCumulative(res_intervals, res_demands, peak)
+        constrained += 1
+    return {"resources": constrained, "closures": closures}
+
+def shared_resources(fleet_df, resources):
+    """
+    Returns the resource IDs demanded by aircraft from more than one base;
+    such resources couple the bases, so the fleet cannot be sharded by base.
+    """
+    if resources is None or "base" not in fleet_df.columns:
+        return []
+    demand = resources["demand"].merge(fleet_df[["aircraft_id", "base"]], on="aircraft_id")
+    bases_per_resource = demand.groupby("resource_id")["base"].nunique()
+    return sorted(bases_per_resource.index[bases_per_resource > 1])
+
+# Available model formulations, selectable per call
+MODEL_BUILDERS = {
+    "daily": build_daily_model,
+    "interval": build_interval_model,
+}
+
+# Urgency weights for the objective
+def compute_weight_values(fleet_df):
+    """
+    Urgency weights as an array aligned with fleet_df rows:
+    urgency = smaller hours_until_due => higher weight, normalized to [1..100].
+
+    Args:
+        fleet_df (DataFrame): Fleet information
+
+    Returns:
+        weight_values (ndarray): int64 weight per fleet row
+    """
+    hours = fleet_df["hours_until_due"].to_numpy().astype(np.int64)
+    max_hours = int(hours.max()) if len(hours) else 1
+    # weight proportional to (max_hours - hours_until_due), truncated like int()
+    return np.maximum(1, ((max_hours - hours) / max_hours * 100).astype(np.int64))
+
+def compute_weights(fleet_df):
+    """
+    Builds a weighted objective that pushes urgent aircraft earlier
+    (see compute_weight_values).
+
+    Args:
+        fleet_df (DataFrame): Fleet information
+
+    Returns:
+        weights (dict): aircraft_id -> integer weight
+    """
+    return dict(zip(fleet_df["aircraft_id"].tolist(), compute_weight_values(fleet_df).tolist()))
+
+# Due days from remaining hours and utilization
+def due_days(fleet_df):
+    """
+    Converts hours_until_due into the day offset on which each aircraft becomes
+    overdue, using its daily_utilization_hours (flight hours per day, default
+    DEFAULT_DAILY_UTILIZATION_HOURS). Aircraft already past due get a negative day.
+
+    Args:
+        fleet_df (DataFrame): Fleet information
+
+    Returns:
+        due (dict): aircraft_id -> due day offset (last day maintenance starts on time)
+    """
+    if "daily_utilization_hours" in fleet_df.columns:
+        utilization = fleet_df["daily_utilization_hours"].to_numpy(dtype=float)
+        utilization = np.where(utilization > 0, utilization, DEFAULT_DAILY_UTILIZATION_HOURS)
+    else:
+        utilization = DEFAULT_DAILY_UTILIZATION_HOURS
+    due = np.floor(fleet_df["hours_until_due"].to_numpy(dtype=float) / utilization).astype(np.int64)
+    return dict(zip(fleet_df["aircraft_id"].tolist(), due.tolist()))
+
+# Weighted tardiness against due days
+def add_tardiness_objective(model, start_day, weights, due, latest_start, hard=False):
+    """
+    Builds the tardiness objective: TARDINESS_PENALTY x sum(weight x days late)
+    plus the weighted start days as a tie-breaker, so on-time aircraft are still
+    scheduled early. Days late is one IntVar per aircraft that can be late
+    (late >= start_day - due), which the minimization keeps tight; aircraft due
+    after latest_start get no variable.
+
+    Args:
+        model (CpModel): Model to populate
+        start_day (dict): aircraft_id -> IntVar start day
+        weights (dict): aircraft_id -> objective weight
+        due (dict): aircraft_id -> due day (see due_days)
+        latest_start (int): Last start day in the model
+        hard (bool): Also require start_day <= due (day 0 for overdue aircraft)
+
+    Returns:
+        objective (LinearExpr): Expression to minimize
+        due_stats (dict): Aircraft due inside the horizon and already overdue
+    """
+    aircraft_list = list(start_day)
+    late_vars = []
+    late_weights = []
+    for aid in aircraft_list:
+        if due[aid] >= latest_start:
+            continue
+        if hard:
+            model.Add(start_day[aid] <= max(due[aid], 0))
+        late = model.NewIntVar(0, latest_start - due[aid], f"late_{aid}")
+        model.Add(late >= start_day[aid] - due[aid])
+        late_vars.append(late)
+        late_weights.append(TARDINESS_PENALTY * weights[aid])
+
+    objective = cp_model.LinearExpr.WeightedSum(
+        [start_day[aid] for aid in aircraft_list] + late_vars,
+        [weights[aid] for aid in aircraft_list] + late_weights)
+    due_stats = {
+        "due_in_horizon": len(late_vars),
+        "overdue": sum(1 for aid in aircraft_list if due[aid] < 0),
+        "hard": hard,
+    }
+    return objective, due_stats
+
+# Objective value of a plan, as the CP-SAT model computes it
+def plan_objective(start_values, weight_values, due_values=None):
+    """
+    sum(start_day x weight), plus TARDINESS_PENALTY x sum(weight x days late)
+    when due_values (tardiness mode) is given. Arguments are aligned arrays.
+    """
+    objective = int(start_values @ weight_values)
+    if due_values is not None:
+        objective += TARDINESS_PENALTY * int(np.maximum(start_values - due_values, 0) @ weight_values)
+    return objective
+
+def tardiness_stats(start_days, due):
+    """
+    Summarizes lateness of a solved plan: late aircraft, total and maximum days late.
+    """
+    late = np.array([max(0, s - due[aid]) for aid, s in start_days.items()], dtype=np.int64)
+    return {
+        "late_aircraft": int((late > 0).sum()),
+        "total_days_late": int(late.sum()),
+        "max_days_late": int(late.max(initial=0)),
+    }
+
+# Vectorized round-robin parts allocation
+def allocate_parts(num_aircraft, parts_df, seed=PARTS_ALLOCATION_SEED, respect_stock=True):
+    """
+    Hands one part line to each aircraft in order, round-robin over parts sorted by
+    quantity_on_hand (descending), skipping parts that are out of stock. Each
+    allocation consumes a random 1..min(3, stock) units.
+
+    With respect_stock=False the round-robin covers every part regardless of stock
+    and each aircraft demands 1..3 units; this is the part demand used by the
+    parts-aware model, where shortages are backordered instead of skipped.
+
+    Instead of walking parts one aircraft at a time, each pass assigns the next
+    block of aircraft to every part still in stock at once: a part is visited at
+    most once per round-robin cycle, so a cycle is a single array operation.
+
+    Args:
+        num_aircraft (int): Number of aircraft to allocate for, in schedule order
+        parts_df (DataFrame): Parts inventory information
+        seed (int): Seed for the quantity draws
+        respect_stock (bool): Skip out-of-stock parts and cap quantities at stock
+
+    Returns:
+        part_ids (ndarray): Allocated part_id per aircraft (None if stock ran out)
+        quantities (ndarray): Units consumed per aircraft
+        costs (ndarray): unit_cost x quantity per aircraft
+    """
+    parts_sorted = parts_df.sort_values("quantity_on_hand", ascending=False)
+    stock = parts_sorted["quantity_on_hand"].to_numpy(dtype=np.int64).copy()
+    unit_cost = parts_sorted["unit_cost"].to_numpy(dtype=float)
+    num_parts = len(stock)
+
+    part_index = np.full(num_aircraft, -1, dtype=np.int64)
+    quantities = np.zeros(num_aircraft, dtype=np.int64)
+    draws = np.random.default_rng(seed).random(num_aircraft)
+
+    if not respect_stock and num_parts:
+        part_index = np.arange(num_aircraft, dtype=np.int64) % num_parts
+        quantities = 1 + (draws * 3).astype(np.int64)
+
+    next_part = 0  # round-robin position
+    allocated = 0
+    while respect_stock and allocated < num_aircraft:
+        in_stock = np.flatnonzero(stock > 0)
+        if in_stock.size == 0:
+            break
+        # One cycle: in-stock parts starting from the round-robin position
+        split = np.searchsorted(in_stock, next_part)
+        cycle = np.concatenate([in_stock[split:], in_stock[:split]])[:num_aircraft - allocated]
+        block = slice(allocated, allocated + cycle.size)
+        # Random consumption: 1..min(3, available stock)
+        taken = 1 + (draws[block] * np.minimum(3, stock[cycle])).astype(np.int64)
+        stock[cycle] -= taken
+        part_index[block] = cycle
+        quantities[block] = taken
+        next_part = (cycle[-1] + 1) % num_parts
+        allocated += cycle.size
+
+    has_part = part_index >= 0
+    part_ids = np.full(num_aircraft, None, dtype=object)
+    part_ids[has_part] = parts_sorted["part_id"].to_numpy(dtype=object)[part_index[has_part]]
+    costs = np.zeros(num_aircraft)
+    costs[has_part] = unit_cost[part_index[has_part]] * quantities[has_part]
+    return part_ids, quantities, costs
+
+# Turn solved start days into the schedule DataFrame
+def build_schedule_df(fleet_df, parts_df, start_days, durations, allocation=None):
+    """
+    Allocates parts to each scheduled aircraft and builds the schedule rows.
+    Start days are offsets from today.
+
+    Args:
+        fleet_df (DataFrame): Fleet information
+        parts_df (DataFrame): Parts inventory information
+        start_days (dict): aircraft_id -> start day offset
+        durations (dict): aircraft_id -> maintenance duration (days)
+        allocation (tuple, optional): Precomputed (part_ids, quantities, costs) aligned
+            with the scheduled aircraft; allocated from stock when omitted
+
+    Returns:
+        df_schedule (DataFrame): Scheduled maintenance for each aircraft
+    """
+    # Aircraft left unscheduled (e.g. deferred past a rolling horizon) get no record
+    scheduled = [aid for aid in fleet_df["aircraft_id"].tolist() if aid in start_days]
+    if allocation is None:
+        allocation = allocate_parts(len(scheduled), parts_df)
+    part_ids, quantities, costs = allocation
+
+    # Dates are offsets from one "today", converted for all rows at once
+    starts = np.fromiter((start_days[aid] for aid in scheduled), dtype=np.int64, count=len(scheduled))
+    ends = starts + np.fromiter((durations[aid] for aid in scheduled), dtype=np.int64, count=len(scheduled))
+    today = pd.Timestamp.now().normalize()
+    df_schedule = pd.DataFrame({
+        "aircraft_id": scheduled,
+        "schedule_start": today + pd.to_timedelta(starts, unit="D"),
+        "schedule_end": today + pd.to_timedelta(ends, unit="D"),
+        "part_id": list(part_ids[:len(scheduled)]),
+        "part_quantity": np.asarray(quantities[:len(scheduled)], dtype=np.int64),
+        "cost": np.asarray(costs[:len(scheduled)], dtype=float),
+        "status": "SCHEDULED",
+    })
+    return df_schedule
+
+# Express a saved schedule as day offsets from today
+def schedule_day_offsets(schedule_df):
+    """
+    Converts schedule_start/schedule_end timestamps into day offsets from today.
+
+    Args:
+        schedule_df (DataFrame): Schedule rows (aircraft_id, schedule_start, schedule_end)
+
+    Returns:
+        dict: aircraft_id -> (start_day, duration); start_day is negative for
+            maintenance that started before today
+    """
+    today = pd.Timestamp.now().normalize()
+    start = pd.to_datetime(schedule_df["schedule_start"]).dt.normalize()
+    end = pd.to_datetime(schedule_df["schedule_end"]).dt.normalize()
+    start_days = (start - today).dt.days.tolist()
+    durations = (end - start).dt.days.tolist()
+    return dict(zip(schedule_df["aircraft_id"].tolist(), zip(start_days, durations)))
+
+# Warm-start hints from a previous schedule
+def build_warm_start_hints(previous_df, aircraft_list, horizon, durations=None, demands=None):
+    """
+    Converts a previous schedule into start_day/duration hints for today's model.
+    Previous assignments are re-based to today's day offsets and accepted when they
+    still fit the horizon, duration bounds and crew capacity. Everything else
+    (new aircraft, past or out-of-range starts, over-capacity days) is repaired by
+    placing the aircraft on the earliest day with a free crew.
+
+    Args:
+        previous_df (DataFrame): Previous schedule (aircraft_id, schedule_start, schedule_end)
+        aircraft_list (list): Aircraft IDs in the current model
+        horizon (int): Number of days in the planning window
+        durations (dict, optional): aircraft_id -> fixed duration; hints must match it
+        demands (dict, optional): aircraft_id -> crews needed (default 1)
+
+    Returns:
+        hints (dict): aircraft_id -> (start_day, duration)
+        hint_stats (dict): counts of accepted, repaired and dropped (no longer in fleet) hints
+    """
+    previous = schedule_day_offsets(previous_df)
+
+    # Crew usage per day, including overflow days past the horizon
+    longest = max(durations.values()) if durations else MAINT_DURATION_MAX
+    crew_used = [0] * (horizon + longest)
+    hints = {}
+    to_repair = []
+    for aid in aircraft_list:
+        if aid not in previous:
+            to_repair.append(aid)
+            continue
+        s, dur = previous[aid]
+        demand = demands[aid] if demands else 1
+        if durations:
+            fits = 0 <= s < horizon and dur == durations[aid]
+        else:
+            fits = 0 <= s < horizon and MAINT_DURATION_MIN <= dur <= MAINT_DURATION_MAX
+        if fits and all(crew_used[d] + demand <= CREW_AVAILABLE for d in range(s, s + dur)):
+            for d in range(s, s + dur):
+                crew_used[d] += demand
+            hints[aid] = (s, dur)
+        else:
+            to_repair.append(aid)
+
+    # Repair: earliest day with enough free crews, at the required (or minimum) duration
+    for aid in to_repair:
+        dur = durations[aid] if durations else MAINT_DURATION_MIN
+        demand = demands[aid] if demands else 1
+        for s in range(horizon):
+            if all(crew_used[d] + demand <= CREW_AVAILABLE for d in range(s, s + dur)):
+                for d in range(s, s + dur):
+                    crew_used[d] += demand
+                hints[aid] = (s, dur)
+                break
+
+    aircraft_set = set(aircraft_list)
+    hint_stats = {
+        "accepted": len(aircraft_list) - len(to_repair),
+        "repaired": len(to_repair),
+        "dropped": sum(1 for aid in previous if aid not in aircraft_set),
+    }
+    return hints, hint_stats
+
+# Greedy list scheduling
+def greedy_schedule(fleet_df, weights=None, release_days=None, resources=None, due=None, crew=None):
+    """
+    Priority-queue list scheduler: aircraft are taken in decreasing urgency weight
+    (earliest due day first when due is given) and each starts on the earliest day a crew becomes free (a min-heap of crew
+    release days), at the minimum maintenance duration. Runs in
+    O(aircraft x log crews) with no solver, so it doubles as a fast mode, a
+    fallback when CP-SAT fails, and a hint for CP-SAT.
+
+    With per-aircraft durations/crew demand (see maintenance_requirements),
+    release days or resources, each aircraft instead takes the earliest day from
+    which enough crews (and resource units) are free for its whole duration.
+
+    Part stock and lead times are only considered through release_days
+    (see parts_release_days).
+
+    Args:
+        fleet_df (DataFrame): Fleet information
+        weights (dict, optional): aircraft_id -> objective weight (default compute_weights)
+        release_days (dict, optional): aircraft_id -> earliest start day
+        resources (dict, optional): Renewable resources (see load_resources)
+        due (dict, optional): aircraft_id -> due day, for the tardiness objective
+            (see due_days)
+        crew (int, optional): Daily crew capacity (default CREW_AVAILABLE)
+
+    Returns:
+        start_days (dict): aircraft_id -> start day offset (may exceed the horizon
+            when the fleet does not fit)
+        durations (dict): aircraft_id -> maintenance duration (days)
+        objective (int): The same objective as the CP-SAT model (see plan_objective)
+    """
+    aircraft_ids = fleet_df["aircraft_id"].to_numpy()
+    if weights is None:
+        weight_values = compute_weight_values(fleet_df)
+    else:
+        weight_values = np.fromiter((weights[aid] for aid in aircraft_ids), dtype=np.int64, count=len(aircraft_ids))
+    due_values = None
+    if due is not None:
+        due_values = np.array([due[aid] for aid in aircraft_ids], dtype=np.int64)
+        # Due days past the horizon tie, matching the model's symmetry breaking
+        order = np.lexsort((-weight_values, np.minimum(due_values, PLANNING_HORIZON_DAYS - 1)))
+    else:
+        order = np.argsort(-weight_values, kind="stable")
+
+    if crew is None:
+        crew = CREW_AVAILABLE
+    fixed_durations, demands = maintenance_requirements(fleet_df)
+    starts = np.empty(len(order), dtype=np.int64)
+    if not release_days and fixed_durations is None and demands is None and resources is None:
+        crew_free = [0] * crew  # day each crew is next available
+        for rank, idx in enumerate(order):
+            day = heapq.heappop(crew_free)
+            starts[rank] = day
+            heapq.heappush(crew_free, day + MAINT_DURATION_MIN)
+        duration_values = np.full(len(order), MAINT_DURATION_MIN, dtype=np.int64)
+    else:
+        # Crews cannot be taken in order of availability, so scan crew usage per
+        # day from each aircraft's release day instead
+        release = np.array([(release_days or {}).get(aid, 0) for aid in aircraft_ids], dtype=np.int64)
+        if fixed_durations is None:
+            duration_values = np.full(len(order), MAINT_DURATION_MIN, dtype=np.int64)
+        else:
+            duration_values = np.array([fixed_durations[aid] for aid in aircraft_ids], dtype=np.int64)
+        demand_values = np.array([demands[aid] for aid in aircraft_ids] if demands else [1] * len(order),
+                                 dtype=np.int64)
+        # Initial size for aircraft queued one after another; the scan grows the
+        # arrays when it runs past the end (calendar exceptions can block a
+        # start on each of the dur days before them)
+        usage = np.zeros(int(release.max(initial=0) + duration_values.sum() + duration_values.max(initial=0) + 1),
+                         dtype=np.int64)
+        needs = {}
+        if resources is not None:
+            resource_ids, res_capacity = resource_capacity(resources, len(usage))
+            res_usage = np.zeros_like(res_capacity)
+            row_of = {rid: i for i, rid in enumerate(resource_ids)}
+            default_capacity = dict(zip(resources["catalog"]["resource_id"], resources["catalog"]["capacity"]))
+            for aid, rid, qty in zip(resources["demand"]["aircraft_id"], resources["demand"]["resource_id"],
+                                     resources["demand"]["quantity"]):
+                if qty > default_capacity[rid]:
+                    raise ValueError(f"{aid} needs {qty} units of {rid}, above its default capacity")
+                needs.setdefault(aid, []).append((row_of[rid], int(qty)))
+        full_until = 0  # every day before this one is at capacity
+        for rank, idx in enumerate(order):
+            day = max(int(release[idx]), full_until)
+            dur = duration_values[idx]
+            free = crew - demand_values[idx]
+            aircraft_needs = needs.get(aircraft_ids[idx], ())
+            while True:
+                if day + dur > len(usage):
+                    size = 2 * (day + dur)
+                    usage = np.concatenate([usage, np.zeros(size - len(usage), dtype=np.int64)])
+                    if resources is not None:
+                        _, res_capacity = resource_capacity(resources, size)
+                        res_usage = np.hstack([res_usage, np.zeros((len(res_usage), size - res_usage.shape[1]),
+                                                                   dtype=np.int64)])
+                if usage[day:day + dur].max() <= free and not any(
+                        (res_usage[row, day:day + dur] + qty > res_capacity[row, day:day + dur]).any()
+                        for row, qty in aircraft_needs):
+                    break
+                day += 1
+            for row, qty in aircraft_needs:
+                res_usage[row, day:day + dur] += qty
+            starts[rank] = day
+            usage[day:day + dur] += demand_values[idx]
+            while full_until < len(usage) and usage[full_until] >= crew:
+                full_until += 1
+
+    start_values = np.empty(len(order), dtype=np.int64)
+    start_values[order] = starts
+    start_days = dict(zip(aircraft_ids.tolist(), start_values.tolist()))
+    durations = dict(zip(aircraft_ids.tolist(), duration_values.tolist()))
+    objective = plan_objective(start_values, weight_values, due_values)
+    return start_days, durations, objective
+
+# Build the CP-SAT model
+def build_model(fleet_df, parts_df=None, formulation=MODEL_FORMULATION, parts_aware=False, weights=None,
+                resources=None, objective_mode=None, hard_due_dates=None):
+    """
+    Builds the scheduling model (variables, capacity, optional part and resource
+    constraints, symmetry breaking and objective) without solving it.
+
+    Args:
+        fleet_df (DataFrame): Fleet information
+        parts_df (DataFrame, optional): Parts inventory (required when parts_aware)
+        formulation (str): Key of MODEL_BUILDERS
+        parts_aware (bool): Model part stock and lead times
+        weights (dict, optional): aircraft_id -> objective weight (default compute_weights)
+        resources (dict, optional): Renewable resources with capacity calendars
+            (see load_resources); interval formulation only
+        objective_mode (str, optional): "weighted_start" or "tardiness" (default OBJECTIVE_MODE)
+        hard_due_dates (bool, optional): Tardiness mode: forbid starting after the due
+            day (default HARD_DUE_DATES)
+
+    Returns:
+        model (CpModel): The populated model
+        start_day (dict): aircraft_id -> IntVar start day
+        duration (dict): aircraft_id -> IntVar maintenance duration
+        allocation (tuple or None): (part_ids, quantities, costs) when parts_aware
+        model_info (dict): parts statistics when parts_aware, resource statistics
+            when resources are given, due-day statistics in tardiness mode
+    """
+    if objective_mode is None:
+        objective_mode = OBJECTIVE_MODE
+    if hard_due_dates is None:
+        hard_due_dates = HARD_DUE_DATES
+    if objective_mode not in ("weighted_start", "tardiness"):
+        raise ValueError(f"Unknown objective mode '{objective_mode}', expected 'weighted_start' or 'tardiness'")
+    model = cp_model.CpModel()
+    horizon = PLANNING_HORIZON_DAYS
+
+    # List of all aircraft IDs
+    aircraft_list = fleet_df["aircraft_id"].tolist()
+
+    # Decision variables and capacity constraint, built by the selected formulation
+    if formulation not in MODEL_BUILDERS:
+        raise ValueError(f"Unknown formulation '{formulation}', expected one of {sorted(MODEL_BUILDERS)}")
+    if resources is not None and formulation != "interval":
+        raise ValueError("Resources are only supported by the interval formulation")
+    durations, demands = maintenance_requirements(fleet_df)
+    start_day, duration = MODEL_BUILDERS[formulation](model, aircraft_list, horizon, durations, demands)
+
+    # Objective weights: urgent aircraft (small hours_until_due) weigh more
+    if weights is None:
+        weights = compute_weights(fleet_df)
+
+    # Part demand and stock/lead-time constraints, when modelled in the solve
+    model_info = {}
+    allocation = None
+    groups = [aircraft_list]
+    if parts_aware:
+        allocation = allocate_parts(len(aircraft_list), parts_df, respect_stock=False)
+        groups, model_info["parts_stats"] = add_parts_constraints(
+            model, start_day, aircraft_list, allocation[0], allocation[1], parts_df)
+
+    # Hangar bays, skilled crews, tooling: one cumulative per resource
+    signatures = None
+    if resources is not None:
+        longest = max(durations.values()) if durations else MAINT_DURATION_MAX
+        model_info["resource_stats"] = add_resource_constraints(
+            model, start_day, duration, durations, resources, horizon - 1 + longest)
+        signatures = resource_signatures(aircraft_list, resources)
+
+    # Tardiness: aircraft also need the same due day (capped at the last start day,
+    # after which nobody is late) to be interchangeable
+    due = None
+    if objective_mode == "tardiness":
+        due = due_days(fleet_df)
+        signatures = {aid: ((signatures or {}).get(aid, ()), min(due[aid], horizon - 1)) for aid in aircraft_list}
+
+    # Aircraft with the same duration, crew and resource demand can swap intervals;
+    # ordering their starts by urgency removes those symmetric solutions
+    if formulation == "interval":
+        for group in groups:
+            for (_, demand, _), members in requirement_groups(group, durations, demands, signatures).items():
+                add_urgency_ordering(model, {aid: start_day[aid] for aid in members}, weights,
+                                     crew=CREW_AVAILABLE // demand)
+
+    # Objective: minimize weighted sum of start days, or weighted days late
+    if due is not None:
+        objective, model_info["due_stats"] = add_tardiness_objective(
+            model, start_day, weights, due, horizon - 1, hard_due_dates)
+        model.Minimize(objective)
+    else:
+        model.Minimize(cp_model.LinearExpr.WeightedSum([start_day[aid] for aid in aircraft_list],
+                                                       [weights[aid] for aid in aircraft_list]))
+    return model, start_day, duration, allocation, model_info
+
+# CP-SAT settings for one solve
+@dataclass(frozen=True)
+class SolverConfig:
+    """
+    Seed, workers, time limit and search settings applied to a CpSolver.
+    Fields default to the SOLVER_* constants at construction time.
+
+    With deterministic=True, identical inputs give bit-identical schedules:
+    the time limit is enforced in CP-SAT deterministic time (a work count that
+    does not depend on machine load; wall time can be several times larger)
+    instead of wall time, and several workers interleave their search in fixed
+    batches instead of racing.
+
+    relative_gap_limit stops the search as soon as the solution is proven within
+    that fraction of the best bound. wall_time_budget caps the whole solve
+    (model build, hints, search and alternatives) in wall time; in deterministic
+    mode results are only reproducible when the budget is not reached.
+    """
+    seed: int = field(default_factory=lambda: SOLVER_SEED)
+    workers: int = field(default_factory=lambda: SOLVER_WORKERS)
+    time_limit: float = field(default_factory=lambda: SOLVER_TIME_LIMIT)
+    interleave_search: bool = field(default_factory=lambda: SOLVER_INTERLEAVE_SEARCH)
+    presolve_level: int = field(default_factory=lambda: SOLVER_PRESOLVE_LEVEL)
+    log_search: bool = field(default_factory=lambda: SOLVER_LOG_SEARCH)
+    deterministic: bool = field(default_factory=lambda: SOLVER_DETERMINISTIC)
+    relative_gap_limit: float = field(default_factory=lambda: SOLVER_RELATIVE_GAP_LIMIT)
+    wall_time_budget: float = field(default_factory=lambda: SOLVER_WALL_TIME_BUDGET)
+
+    def apply(self, solver, time_limit=None, deadline=None):
+        """
+        Sets the solver parameters; time_limit overrides the configured limit
+        (e.g. per window or per neighbourhood), and deadline (time.perf_counter()
+        value, see wall_time_budget) caps the solve's wall time.
+        """
+        params = solver.parameters
+        limit = self.time_limit if time_limit is None else time_limit
+        params.random_seed = self.seed
+        params.num_search_workers = self.workers
+        params.interleave_search = self.interleave_search or (self.deterministic and self.workers > 1)
+        if self.deterministic:
+            params.max_deterministic_time = limit
+        else:
+            params.max_time_in_seconds = limit
+        if self.presolve_level == 0:
+            params.cp_model_presolve = False
+        elif self.presolve_level == 1:
+            params.max_presolve_iterations = 1
+        params.log_search_progress = self.log_search
+        if self.relative_gap_limit:
+            params.relative_gap_limit = self.relative_gap_limit
+        if deadline is not None:
+            params.max_time_in_seconds = max(0.0, min(params.max_time_in_seconds, deadline - time.perf_counter()))
+        return solver
+
+    def constants(self):
+        """
+        The SOLVER_* constants matching this config, to merge into planning_params()
+        so solves in worker processes use it too.
+        """
+        return {
+            "SOLVER_SEED": self.seed,
+            "SOLVER_WORKERS": self.workers,
+            "SOLVER_TIME_LIMIT": self.time_limit,
+            "SOLVER_INTERLEAVE_SEARCH": self.interleave_search,
+            "SOLVER_PRESOLVE_LEVEL": self.presolve_level,
+            "SOLVER_LOG_SEARCH": self.log_search,
+            "SOLVER_DETERMINISTIC": self.deterministic,
+            "SOLVER_RELATIVE_GAP_LIMIT": self.relative_gap_limit,
+            "SOLVER_WALL_TIME_BUDGET": self.wall_time_budget,
+        }
+
+# Intermediate solutions, streamed as they are found
+class SolutionProgressCallback(cp_model.CpSolverSolutionCallback):
+    """
+    Records (wall_time, objective, best_bound) for every improving solution and
+    optionally forwards each record to on_solution, e.g. to print progress or
+    decide on max_time_in_seconds from how quickly the objective settles.
+    """
+    def __init__(self, on_solution=None):
+        super().__init__()
+        self.progress = []
+        self._on_solution = on_solution
+
+    def on_solution_callback(self):
+        record = {
+            "wall_time": self.WallTime(),
+            "objective": self.ObjectiveValue(),
+            "best_bound": self.BestObjectiveBound(),
+        }
+        self.progress.append(record)
+        if self._on_solution is not None:
+            self._on_solution(record)
+
+# Model and solver statistics for one solve
+def collect_solve_stats(model, solver, progress, build_time, status=None):
+    """
+    Summarizes where time went: Python model construction versus solver.Solve.
+
+    Args:
+        model (CpModel): The solved model
+        solver (CpSolver): Solver after Solve returned
+        progress (SolutionProgressCallback): Callback passed to Solve
+        build_time (float): Wall time spent building the model (seconds)
+        status (int, optional): Status returned by Solve, for stop_reason
+
+    Returns:
+        dict: build/solve times, model size, bound, gap, why the search stopped
+            (optimal, gap_limit, time_limit, infeasible or no_solution) and the
+            limits in force, search counters, per-solution progress and the raw
+            ResponseStats() text
+    """
+    proto = model.Proto()
+    objective = progress.progress[-1]["objective"] if progress.progress else None
+    best_bound = solver.BestObjectiveBound()
+    gap = abs(objective - best_bound) / max(1.0, abs(objective)) if objective is not None else None
+    # CP-SAT reports OPTIMAL when it stops on relative_gap_limit
+    if status == cp_model.OPTIMAL:
+        stop_reason = "gap_limit" if gap else "optimal"
+    elif status == cp_model.FEASIBLE:
+        stop_reason = "time_limit"
+    elif status == cp_model.INFEASIBLE:
+        stop_reason = "infeasible"
+    else:
+        stop_reason = "no_solution"
+    params = solver.parameters
+    return {
+        "build_time": build_time,
+        "num_variables": len(proto.variables),
+        "num_constraints": len(proto.constraints),
+        "wall_time": solver.WallTime(),
+        "user_time": solver.UserTime(),
+        "best_bound": best_bound,
+        "gap": gap,
+        "stop_reason": stop_reason,
+        "time_limit": min(params.max_time_in_seconds, params.max_deterministic_time),
+        "gap_limit": params.relative_gap_limit,
+        "num_solutions": len(progress.progress),
+        "num_branches": solver.NumBranches(),
+        "num_conflicts": solver.NumConflicts(),
+        "progress": progress.progress,
+        "response_stats": solver.ResponseStats(),
+    }
+
+# Batched read of a solved assignment
+def read_solution(solver, start_day, duration, aircraft_list):
+    """
+    Reads start days and durations for aircraft_list with one solver.Values call
+    per variable family instead of one solver.Value call per aircraft.
+
+    Returns:
+        start_days (dict): aircraft_id -> start day
+        durations (dict): aircraft_id -> duration (days)
+    """
+    if not aircraft_list:
+        return {}, {}
+    starts = solver.Values(pd.Series([start_day[aid] for aid in aircraft_list]))
+    lengths = solver.Values(pd.Series([duration[aid] for aid in aircraft_list]))
+    return dict(zip(aircraft_list, starts.tolist())), dict(zip(aircraft_list, lengths.tolist()))
+
+# Near-optimal alternatives by iterative no-good cuts
+def find_alternatives(model, start_day, duration, aircraft_list, previous, count, solver_config=None,
+                      min_changes=ALTERNATIVES_MIN_CHANGES, deadline=None):
+    """
+    Re-solves a solved model up to count times, each time cutting off the last
+    solution: at least min_changes aircraft must start on a different day than
+    in every earlier schedule. Symmetry breaking stays in the model, so
+    alternatives are not plain swaps of interchangeable aircraft.
+
+    Args:
+        model (CpModel): Model that produced previous (cuts are added to it)
+        start_day (dict): aircraft_id -> IntVar start day
+        duration (dict): aircraft_id -> IntVar maintenance duration
+        aircraft_list (list): Aircraft IDs
+        previous (dict): aircraft_id -> start day of the solution already found
+        count (int): Maximum number of alternatives
+        solver_config (SolverConfig, optional): Solver settings; each solve is limited
+            to ALTERNATIVES_TIME_LIMIT
+        min_changes (int): Aircraft that must move relative to each earlier schedule
+        deadline (float, optional): time.perf_counter() value after which no further
+            alternative is searched
+
+    Returns:
+        list: {objective, status, start_days, durations} per alternative, in the order
+            found (stops early when no further schedule exists or none is found in time)
+    """
+    alternatives = []
+    for _ in range(count):
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        # start == previous start unless its "same" literal is true; at most
+        # n - min_changes of those literals may be true
+        same = []
+        for aid in aircraft_list:
+            literal = model.NewBoolVar(f"same_{aid}_{len(alternatives)}")
+            model.Add(start_day[aid] != previous[aid]).OnlyEnforceIf(literal.Not())
+            same.append(literal)
+        model.Add(sum(same) <= len(aircraft_list) - min_changes)
+
+        model.ClearHints()
+        for aid in aircraft_list:
+            model.AddHint(start_day[aid], previous[aid])
+        solver = (solver_config or SolverConfig()).apply(cp_model.CpSolver(), ALTERNATIVES_TIME_LIMIT, deadline)
+        status = solver.Solve(model)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            break
+        start_days, durations = read_solution(solver, start_day, duration, aircraft_list)
+        alternatives.append({
+            "objective": solver.ObjectiveValue(),
+            "status": solver.StatusName(status),
+            "start_days": start_days,
+            "durations": durations,
+        })
+        previous = start_days
+    return alternatives
+
+# Build and solve the CP-SAT model
+def solve_start_days(fleet_df, parts_df, formulation=MODEL_FORMULATION, warm_start=False, parts_aware=False,
+                     weights=None, engine=SCHEDULER_ENGINE, greedy_hint=False, on_solution=None, resources=None,
+                     objective_mode=None, hard_due_dates=None, solver_config=None, top_k=1):
+    """
+    Builds and solves the scheduling model for fleet_df, without assembling the
+    schedule DataFrame. See generate_schedule for the arguments; weights overrides
+    the urgency weights computed from fleet_df (e.g. fleet-wide weights for a shard).
+
+    Returns:
+        start_days (dict): aircraft_id -> start day offset
+        durations (dict): aircraft_id -> maintenance duration (days)
+        allocation (tuple or None): (part_ids, quantities, costs) when parts_aware
+        solve_info (dict): objective, status and solve_stats (see collect_solve_stats),
+            plus hint/parts statistics when enabled, tardiness_stats in tardiness mode
+            and alternatives when top_k > 1
+    """
+    if top_k > 1 and engine != "cpsat":
+        raise ValueError("Alternative schedules (top_k > 1) need the 'cpsat' engine")
+    started = time.perf_counter()
+    if solver_config is None:
+        solver_config = SolverConfig()
+    deadline = started + solver_config.wall_time_budget if solver_config.wall_time_budget else None
+    horizon = PLANNING_HORIZON_DAYS
+    aircraft_list = fleet_df["aircraft_id"].tolist()
+    if objective_mode is None:
+        objective_mode = OBJECTIVE_MODE
+    if hard_due_dates is None:
+        hard_due_dates = HARD_DUE_DATES
+
+    # Objective weights: urgent aircraft (small hours_until_due) weigh more
+    if weights is None:
+        weights = compute_weights(fleet_df)
+    due = due_days(fleet_df) if objective_mode == "tardiness" else None
+
+    # Fast mode: greedy list scheduling only, with part waits as release days
+    if engine == "greedy":
+        started = time.perf_counter()
+        allocation = None
+        release_days = None
+        if parts_aware:
+            allocation = allocate_parts(len(aircraft_list), parts_df, respect_stock=False)
+            release_days = parts_release_days(aircraft_list, allocation[0], allocation[1], parts_df, weights)
+        start_days, durations, objective = greedy_schedule(fleet_df, weights, release_days, resources, due)
+        solve_info = {
+            "engine": "greedy",
+            "objective": float(objective),
+            "status": "GREEDY",
+            "solve_time": time.perf_counter() - started,
+        }
+        if due is not None:
+            solve_info["tardiness_stats"] = tardiness_stats(start_days, due)
+        return start_days, durations, allocation, solve_info
+    # Large fleets: large neighbourhood search around an initial plan
+    if engine == "lns":
+        if resources is not None:
+            raise ValueError("Resources are supported by the 'cpsat' and 'greedy' engines")
+        if objective_mode != "weighted_start":
+            raise ValueError("The tardiness objective is supported by the 'cpsat' and 'greedy' engines")
+        return lns_start_days(fleet_df, parts_df, parts_aware, weights, on_solution=on_solution,
+                              solver_config=solver_config)
+    if engine != "cpsat":
+        raise ValueError(f"Unknown engine '{engine}', expected 'cpsat', 'greedy' or 'lns'")
+
+    build_started = time.perf_counter()
+    model, start_day, duration, allocation, solve_info = build_model(
+        fleet_df, parts_df, formulation, parts_aware, weights, resources, objective_mode, hard_due_dates)
+    build_time = time.perf_counter() - build_started
+
+    # Solution hints: the greedy plan and/or the previously saved schedule (which wins);
+    # parts-aware, the greedy plan waits for part lead times like the model does
+    hints = {}
+    greedy = None
+    if greedy_hint or GREEDY_FALLBACK:
+        release_days = None
+        if parts_aware:
+            release_days = parts_release_days(aircraft_list, allocation[0], allocation[1], parts_df, weights)
+        greedy = greedy_schedule(fleet_df, weights, release_days, resources, due)
+    if greedy_hint:
+        solve_info["greedy_objective"] = float(greedy[2])
+        hints.update((aid, (s, greedy[1][aid])) for aid, s in greedy[0].items() if s < horizon)
+    fixed_durations, demands = maintenance_requirements(fleet_df)
+    if warm_start:
+        warm_hints, solve_info["hint_stats"] = build_warm_start_hints(
+            load_previous_schedule(), aircraft_list, horizon, fixed_durations, demands)
+        hints.update(warm_hints)
+    for aid, (s, dur) in hints.items():
+        model.AddHint(start_day[aid], s)
+        if fixed_durations is None:
+            model.AddHint(duration[aid], dur)
 
     # Solve the model
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = 30.0
-    solver.parameters.num_search_workers = 8
+    solver = solver_config.apply(cp_model.CpSolver(), deadline=deadline)
 
-    status = solver.Solve(model)
+    progress = SolutionProgressCallback(on_solution)
+    status = solver.Solve(model, progress)
+    solve_info["solve_stats"] = collect_solve_stats(model, solver, progress, build_time, status)
     if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        # Fall back to the greedy plan when it fits the horizon (and the due days, if hard)
+        if greedy is not None and all(s < horizon for s in greedy[0].values()) and not (
+                due is not None and hard_due_dates and any(s > max(due[aid], 0) for aid, s in greedy[0].items())):
+            solve_info.update({
+                "engine": "greedy-fallback",
+                "objective": float(greedy[2]),
+                "status": "GREEDY",
+                "solve_time": solver.WallTime(),
+            })
+            if due is not None:
+                solve_info["tardiness_stats"] = tardiness_stats(greedy[0], due)
+            return greedy[0], greedy[1], allocation, solve_info
         raise RuntimeError("No feasible solution found")
 
+    solve_info["engine"] = "cpsat"
+    start_days, durations = read_solution(solver, start_day, duration, aircraft_list)
+    solve_info["objective"] = solver.ObjectiveValue()
+    solve_info["status"] = solver.StatusName(status)
+    solve_info["solve_time"] = solver.WallTime()
+    if due is not None:
+        solve_info["tardiness_stats"] = tardiness_stats(start_days, due)
+
+    # Alternatives, stored compactly as start/duration lists aligned with "aircraft"
+    if top_k > 1:
+        found = find_alternatives(model, start_day, duration, aircraft_list, start_days, top_k - 1, solver_config,
+                                  deadline=deadline)
+        solutions = [{"objective": solve_info["objective"], "status": solve_info["status"],
+                      "start_days": start_days, "durations": durations}] + found
+        solve_info["alternatives"] = {
+            "aircraft": aircraft_list,
+            "solutions": [{
+                "rank": rank,
+                "objective": solution["objective"],
+                "status": solution["status"],
+                "starts": [solution["start_days"][aid] for aid in aircraft_list],
+                "durations": [solution["durations"][aid] for aid in aircraft_list],
+            } for rank, solution in enumerate(solutions)],
+        }
+    return start_days, durations, allocation, solve_info
+
+# Generate optimized maintenance schedule
+def generate_schedule(fleet_df, parts_df, formulation=MODEL_FORMULATION, warm_start=False, use_cache=False,
+                      parts_aware=False, engine=SCHEDULER_ENGINE, greedy_hint=False, on_solution=None,
+                      resources=None, objective_mode=None, hard_due_dates=None, solver_config=None, top_k=1,
+                      record_run=None):
+    """
+    Creates a maintenance schedule using OR-Tools CP-SAT solver.
+    The schedule respects crew availability, urgency (hours until maintenance due),
+    and available parts.
+    
+    Args:
+        fleet_df (DataFrame): Fleet information
+        parts_df (DataFrame): Parts inventory information
+        formulation (str): "interval" (interval vars + AddCumulative) or "daily" (per-day booleans)
+        warm_start (bool): Hint the solver with the schedule saved in maintenance_records;
+            accepted/repaired counts are reported in df_schedule.attrs["hint_stats"]
+        use_cache (bool): Return the stored schedule when fleet, parts, planning
+            parameters and the plan date are unchanged since a previous solve, and
+            store new results (except greedy fallbacks)
+        parts_aware (bool): Assign part demand before solving and model stock and
+            lead times (see add_parts_constraints) instead of allocating after the solve
+        engine (str): "cpsat" to solve the model, "greedy" for greedy_schedule only, or
+            "lns" for lns_start_days (large fleets); with GREEDY_FALLBACK, a CP-SAT
+            failure returns the greedy plan instead of raising
+        greedy_hint (bool): Hint CP-SAT with the greedy plan
+        on_solution (callable, optional): Called with {wall_time, objective, best_bound}
+            for each intermediate solution
+        resources (dict, optional): Hangar bays, skilled crews and tooling with capacity
+            calendars (see load_resources), on top of CREW_AVAILABLE
+        objective_mode (str, optional): "weighted_start" (default OBJECTIVE_MODE) or
+            "tardiness" to minimize weighted days past each aircraft's due day
+            (see due_days); lateness is reported in df_schedule.attrs["tardiness_stats"]
+        hard_due_dates (bool, optional): Tardiness mode: no aircraft may start after
+            its due day (default HARD_DUE_DATES)
+        solver_config (SolverConfig, optional): Seed, workers, time limit and search
+            settings (default: the SOLVER_* constants); deterministic=True makes
+            identical inputs give identical schedules
+        top_k (int): Also search for top_k - 1 distinct near-optimal alternatives
+            (see find_alternatives), returned in df_schedule.attrs["alternatives"]
+            and saved with save_alternatives_to_db; cpsat engine only
+        record_run (bool, optional): Log the solve (bound, gap, stop reason) to the
+            solver_runs table (default RECORD_SOLVER_RUNS); the run ID is returned in
+            df_schedule.attrs["run_id"]
+    
+    Returns:
+        df_schedule (DataFrame): Scheduled maintenance for each aircraft; CP-SAT solves
+            report build/solver statistics in df_schedule.attrs["solve_stats"]
+    """
+    # Identical inputs and parameters give a cached result without solving
+    cache_key = None
+    if objective_mode is None:
+        objective_mode = OBJECTIVE_MODE
+    if hard_due_dates is None:
+        hard_due_dates = HARD_DUE_DATES
+    if solver_config is None:
+        solver_config = SolverConfig()
+    if use_cache:
+        cache_key = schedule_cache_key(fleet_df, parts_df, cache_params(
+            solver_config, formulation, parts_aware, engine, objective_mode, hard_due_dates, top_k), resources)
+        cached = get_cached_schedule(cache_key)
+        if cached is not None:
+            return cached
+
+    start_days, durations, allocation, solve_info = solve_start_days(
+        fleet_df, parts_df, formulation, warm_start, parts_aware, engine=engine, greedy_hint=greedy_hint,
+        on_solution=on_solution, resources=resources, objective_mode=objective_mode,
+        hard_due_dates=hard_due_dates, solver_config=solver_config, top_k=top_k)
+
     # Build schedule result (DataFrame)
-    schedule_rows = []
-    # copy parts for in-memory allocation and sort by quantity descending for distribution
-    parts_copy = parts_df.copy().sort_values("quantity_on_hand", ascending=False).reset_index(drop=True)
-    part_idx = 0  # round-robin index for allocating parts
-
-    # total available parts sum
-    total_parts_available = int(parts_copy["quantity_on_hand"].sum()) if not parts_copy.empty else 0
-
-    for i, row in fleet_df.iterrows():
-        aid = row["aircraft_id"]
-        s = int(solver.Value(start_day[aid]))
-        dur = int(solver.Value(duration[aid]))
-        # Defaults if no parts allocated
-        part_id = None
-        part_quantity = 0
-        cost = 0.0
-
-        # Allocate one unit if parts available
-        if total_parts_available > 0 and not parts_copy.empty:
-            attempts = 0
-            allocated = False
-            while attempts < len(parts_copy) and not allocated:
-                # wrap index
-                if part_idx >= len(parts_copy):
-                    part_idx = 0
-                prow = parts_copy.loc[part_idx]
-                avail = int(prow["quantity_on_hand"])
-                if avail > 0:
-                    part_id = prow["part_id"]
-                    # Random consumption: 1..min(3, available stock)
-                    part_quantity = random.randint(1, min(3, avail))
-                    unit_cost = float(prow["unit_cost"])
-                    cost = unit_cost * part_quantity
-                    # Update (decrement) in-memory stock
-                    parts_copy.at[part_idx, "quantity_on_hand"] = avail - part_quantity
-                    total_parts_available -= part_quantity
-                    allocated = True
-                    # move part_idx forward for next allocation
-                    part_idx = (part_idx + 1) % len(parts_copy)
-                else:
-                    part_idx = (part_idx + 1) % len(parts_copy)
-                    attempts += 1
-            # if no allocation found, defaults remain
-
-        schedule_rows.append({
-            "aircraft_id": aid,
-            "schedule_start": pd.Timestamp.now().normalize() + pd.Timedelta(days=s),
-            "schedule_end": pd.Timestamp.now().normalize() + pd.Timedelta(days=s + dur),
-            "part_id": part_id,
-            "part_quantity": part_quantity,
-            "cost": cost,
-            "status": "SCHEDULED"
+    df_schedule = build_schedule_df(fleet_df, parts_df, start_days, durations, allocation)
+    df_schedule.attrs.update(solve_info)
+    if record_run if record_run is not None else RECORD_SOLVER_RUNS:
+        df_schedule.attrs["run_id"] = record_solver_run(df_schedule, {
+            "num_aircraft": len(fleet_df),
+            "horizon_days": PLANNING_HORIZON_DAYS,
+            "crew": CREW_AVAILABLE,
+            "formulation": formulation,
+            "workers": solver_config.workers,
+            "deterministic": solver_config.deterministic,
+        })
+    # A greedy fallback (the solve failed or timed out) would otherwise be returned
+    # for every later run in place of a real solve
+    if cache_key is not None and solve_info["engine"] != "greedy-fallback":
+        store_schedule(cache_key, df_schedule)
+    return df_schedule
+
+# Parameters that identify a solve in the schedule cache
+def cache_params(solver_config, formulation, parts_aware=False, engine=SCHEDULER_ENGINE, objective_mode=None,
+                 hard_due_dates=None, top_k=1):
+    """
+    Returns the planning and solver parameters that affect a schedule, for
+    schedule_cache_key. Schedules hold absolute dates (and calendar offsets count
+    from today), so the plan date is included: a run on another day solves again.
+    """
+    return {
+        "plan_date": pd.Timestamp.now().normalize().date().isoformat(),
+        "horizon": PLANNING_HORIZON_DAYS,
+        "duration_min": MAINT_DURATION_MIN,
+        "duration_max": MAINT_DURATION_MAX,
+        "crew": CREW_AVAILABLE,
+        "solver": asdict(solver_config),
+        "formulation": formulation,
+        "parts_aware": parts_aware,
+        "engine": engine,
+        "objective_mode": objective_mode if objective_mode is not None else OBJECTIVE_MODE,
+        "hard_due_dates": hard_due_dates if hard_due_dates is not None else HARD_DUE_DATES,
+        "tardiness_penalty": TARDINESS_PENALTY,
+        "top_k": top_k,
+    }
+
+# Planning parameters to reproduce a solve in another process
+def planning_params():
+    """
+    Returns the module-level planning constants, so worker processes (which
+    re-import this module under spawn) solve with the caller's settings.
+    """
+    return {
+        "PLANNING_HORIZON_DAYS": PLANNING_HORIZON_DAYS,
+        "MAINT_DURATION_MIN": MAINT_DURATION_MIN,
+        "MAINT_DURATION_MAX": MAINT_DURATION_MAX,
+        "CREW_AVAILABLE": CREW_AVAILABLE,
+        "SOLVER_SEED": SOLVER_SEED,
+        "SOLVER_TIME_LIMIT": SOLVER_TIME_LIMIT,
+        "SOLVER_WORKERS": SOLVER_WORKERS,
+        "SOLVER_INTERLEAVE_SEARCH": SOLVER_INTERLEAVE_SEARCH,
+        "SOLVER_PRESOLVE_LEVEL": SOLVER_PRESOLVE_LEVEL,
+        "SOLVER_LOG_SEARCH": SOLVER_LOG_SEARCH,
+        "SOLVER_DETERMINISTIC": SOLVER_DETERMINISTIC,
+        "SOLVER_RELATIVE_GAP_LIMIT": SOLVER_RELATIVE_GAP_LIMIT,
+        "SOLVER_WALL_TIME_BUDGET": SOLVER_WALL_TIME_BUDGET,
+        "OBJECTIVE_MODE": OBJECTIVE_MODE,
+        "HARD_DUE_DATES": HARD_DUE_DATES,
+        "TARDINESS_PENALTY": TARDINESS_PENALTY,
+    }
+
+def _solve_shard(shard_fleet, params, formulation, weights, resources, warm_start):
+    """
+    Process-pool worker: applies the planning parameters and solves one shard.
+    """
+    globals().update(params)
+    start_days, durations, _, solve_info = solve_start_days(
+        shard_fleet, None, formulation, warm_start, weights=weights, resources=resources)
+    return start_days, durations, solve_info
+
+# Fleet sharding by maintenance base
+def generate_schedule_sharded(fleet_df, parts_df, formulation=MODEL_FORMULATION, max_workers=None,
+                              resources=None, solver_config=None, warm_start=False, use_cache=False,
+                              record_run=None):
+    """
+    Solves each maintenance base as an independent model in a process pool, then
+    merges the shards into one schedule. Bases share no aircraft or crew, so the
+    merged plan is what a single model would find, at a fraction of the size.
+
+    Crew capacity per base comes from CREW_BY_BASE (default CREW_AVAILABLE).
+    Urgency weights are computed over the whole fleet, and parts are allocated
+    once over the merged schedule, since the inventory is shared.
+
+    Args:
+        fleet_df (DataFrame): Fleet information, with a "base" column
+        parts_df (DataFrame): Parts inventory information
+        formulation (str): Model formulation used for every shard
+        max_workers (int, optional): Process pool size (default: one per CPU)
+        resources (dict, optional): Renewable resources (see load_resources); each
+            must be used by a single base
+        solver_config (SolverConfig, optional): Solver settings for every shard
+        warm_start (bool): Hint each shard with its part of the saved schedule
+        use_cache (bool): As in generate_schedule; per-base crews are part of the key
+        record_run (bool, optional): Log each shard's solve to solver_runs (default
+            RECORD_SOLVER_RUNS); run IDs are in attrs["shards"]
+
+    Returns:
+        df_schedule (DataFrame): Merged schedule; attrs["shards"] holds per-base stats
+    """
+    shared = shared_resources(fleet_df, resources)
+    if shared:
+        raise ValueError(f"Resources {shared} are shared between bases; solve the fleet without sharding")
+    if solver_config is None:
+        solver_config = SolverConfig()
+    cache_key = None
+    if use_cache:
+        params = cache_params(solver_config, formulation)
+        params.update({"sharded": True, "crew_by_base": CREW_BY_BASE})
+        cache_key = schedule_cache_key(fleet_df, parts_df, params, resources)
+        cached = get_cached_schedule(cache_key)
+        if cached is not None:
+            return cached
+    weights = compute_weights(fleet_df)
+    shards = list(fleet_df.groupby("base", sort=True))
+
+    futures = []
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for base, shard_fleet in shards:
+            params = {**planning_params(), **solver_config.constants()}
+            params["CREW_AVAILABLE"] = CREW_BY_BASE.get(base, CREW_AVAILABLE)
+            shard_weights = {aid: weights[aid] for aid in shard_fleet["aircraft_id"]}
+            futures.append(pool.submit(_solve_shard, shard_fleet, params, formulation, shard_weights, resources,
+                                       warm_start))
+
+        start_days = {}
+        durations = {}
+        shard_stats = []
+        for (base, shard_fleet), future in zip(shards, futures):
+            shard_starts, shard_durations, solve_info = future.result()
+            start_days.update(shard_starts)
+            durations.update(shard_durations)
+            shard_stat = {
+                "base": base,
+                "aircraft": len(shard_fleet),
+                "crew": CREW_BY_BASE.get(base, CREW_AVAILABLE),
+                "engine": solve_info["engine"],
+                "status": solve_info["status"],
+                "objective": solve_info["objective"],
+                "solve_time": solve_info["solve_time"],
+            }
+            if record_run if record_run is not None else RECORD_SOLVER_RUNS:
+                # Each shard is its own solve, logged with its own fleet size and crew
+                shard_df = pd.DataFrame({"aircraft_id": list(shard_starts)})
+                shard_df.attrs.update(solve_info)
+                shard_stat["run_id"] = record_solver_run(shard_df, {
+                    "num_aircraft": len(shard_fleet),
+                    "horizon_days": PLANNING_HORIZON_DAYS,
+                    "crew": shard_stat["crew"],
+                    "formulation": formulation,
+                    "workers": solver_config.workers,
+                    "deterministic": solver_config.deterministic,
+                })
+            shard_stats.append(shard_stat)
+
+    df_schedule = build_schedule_df(fleet_df, parts_df, start_days, durations)
+    df_schedule.attrs["shards"] = shard_stats
+    df_schedule.attrs["objective"] = sum(s["objective"] for s in shard_stats)
+    # Greedy fallbacks are not cached, as in generate_schedule
+    if cache_key is not None and all(s["engine"] != "greedy-fallback" for s in shard_stats):
+        store_schedule(cache_key, df_schedule)
+    return df_schedule
+
+# Rolling-horizon decomposition
+def generate_schedule_rolling(fleet_df, parts_df, total_days=ROLLING_TOTAL_DAYS,
+                              window_days=PLANNING_HORIZON_DAYS, commit_days=ROLLING_COMMIT_DAYS, solver_config=None):
+    """
+    Plans a long horizon by solving overlapping windows with the interval
+    formulation. Each window looks ahead window_days, freezes the starts that
+    fall in its first commit_days, then slides forward by commit_days.
+
+    Aircraft that do not fit in a window are deferred at a cost of
+    weight x window length, so every window stays feasible. Maintenance
+    committed earlier that runs into the next window still occupies crew there.
+
+    Args:
+        fleet_df (DataFrame): Fleet information
+        parts_df (DataFrame): Parts inventory information
+        total_days (int): Number of days to plan
+        window_days (int): Lookahead length of each window
+        commit_days (int): Days committed per window (1..window_days)
+        solver_config (SolverConfig, optional): Solver settings; each window is limited
+            to ROLLING_WINDOW_TIME_LIMIT
+
+    Returns:
+        df_schedule (DataFrame): Scheduled maintenance for each aircraft that fits in
+            total_days. attrs["windows"] holds per-window stats and attrs["objective"]
+            the weighted start objective over the whole plan.
+    """
+    if not 1 <= commit_days <= window_days:
+        raise ValueError("commit_days must be between 1 and window_days")
+
+    weights = compute_weights(fleet_df)
+    fixed_durations, demands = maintenance_requirements(fleet_df)
+    pending = sorted(fleet_df["aircraft_id"].tolist(), key=lambda aid: -weights[aid])
+    start_days = {}
+    durations = {}
+    window_stats = []
+
+    window_start = 0
+    while window_start < total_days and pending:
+        horizon = min(window_days, total_days - window_start)
+        is_last = window_start + horizon >= total_days
+        build_started = time.perf_counter()
+        model = cp_model.CpModel()
+
+        # Committed maintenance still running at window start keeps its crew
+        intervals = []
+        demand_list = []
+        for aid, s in start_days.items():
+            remaining = s + durations[aid] - window_start
+            if remaining > 0:
+                intervals.append(model.NewFixedSizeIntervalVar(0, remaining, f"carry_{aid}"))
+                demand_list.append(demands[aid] if demands else 1)
+        num_carried = len(intervals)
+
+        # Scheduled aircraft always form a prefix of the urgency order (per group of
+        # interchangeable aircraft), and at most CREW_AVAILABLE per day can start,
+        # so later aircraft need not enter the model
+        candidates = []
+        for members in requirement_groups(pending, fixed_durations, demands).values():
+            candidates += members[:CREW_AVAILABLE * horizon]
+
+        # Pending aircraft either start inside the window or are deferred (start == horizon).
+        # A fixed blocker holds the extra capacity over the window, so only the
+        # deferral day and beyond can absorb every pending aircraft
+        start_day = {}
+        duration = {}
+        for aid in candidates:
+            start_day[aid], duration[aid], interval = new_maintenance_interval(
+                model, aid, horizon, fixed_durations[aid] if fixed_durations else None)
+            intervals.append(interval)
+            demand_list.append(demands[aid] if demands else 1)
+        deferral_capacity = sum(demand_list[num_carried:])
+        intervals.append(model.NewFixedSizeIntervalVar(0, horizon, "deferral_blocker"))
+        demand_list.append(deferral_capacity)
+        model.AddCumulative(intervals, demand_list, CREW_AVAILABLE + deferral_capacity)
+
+        # Pending aircraft with the same duration and crew demand are interchangeable,
+        # so the urgency ordering still holds within each group
+        for (_, demand, _), members in requirement_groups(candidates, fixed_durations, demands).items():
+            add_urgency_ordering(model, {aid: start_day[aid] for aid in members}, weights,
+                                 latest_start=horizon, crew=CREW_AVAILABLE // demand)
+        model.Minimize(sum(start_day[aid] * weights[aid] for aid in candidates))
+        build_time = time.perf_counter() - build_started
+
+        solver = (solver_config or SolverConfig()).apply(cp_model.CpSolver(), ROLLING_WINDOW_TIME_LIMIT)
+        status = solver.Solve(model)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            raise RuntimeError(f"No feasible solution found for window starting day {window_start}")
+
+        # Freeze starts inside the committed part of the window (all of it on the last one)
+        commit_limit = horizon if is_last else commit_days
+        committed = []
+        window_starts, window_durations = read_solution(solver, start_day, duration, candidates)
+        for aid in candidates:
+            s = window_starts[aid]
+            if s < commit_limit:
+                start_days[aid] = window_start + s
+                durations[aid] = window_durations[aid]
+                committed.append(aid)
+        pending = [aid for aid in pending if aid not in start_days]
+
+        window_stats.append({
+            "window_start": window_start,
+            "window_end": window_start + horizon,
+            "candidates": len(candidates),
+            "carried_over": num_carried,
+            "committed": len(committed),
+            "status": solver.StatusName(status),
+            "objective": solver.ObjectiveValue(),
+            "build_time": build_time,
+            "solve_time": solver.WallTime(),
         })
+        if is_last:
+            break
+        window_start += commit_days
 
-    df_schedule = pd.DataFrame(schedule_rows)
+    if pending:
+        print(f"{len(pending)} aircraft could not be scheduled within {total_days} days")
+
+    df_schedule = build_schedule_df(fleet_df, parts_df, start_days, durations)
+    df_schedule.attrs["windows"] = window_stats
+    df_schedule.attrs["objective"] = float(sum(s * weights[aid] for aid, s in start_days.items()))
     return df_schedule
 
+# Large neighbourhood search
+def _lns_submodel(relaxed, weights, hints, background, requirements, short_demand, residual_stock,
+                  time_limit, workers):
+    """
+    Re-solves one neighbourhood: the relaxed aircraft are free, every other
+    aircraft is reduced to its per-day crew usage (background) and, for short
+    parts, to the stock it already consumes (residual_stock).
+
+    Args:
+        relaxed (list): aircraft_id to re-place
+        weights (dict): aircraft_id -> objective weight
+        hints (dict): aircraft_id -> (start_day, duration) in the incumbent
+        background (list): Crews used per day by the fixed aircraft
+        requirements (tuple): (durations, demands) of the relaxed aircraft, as
+            returned by maintenance_requirements
+        short_demand (dict): aircraft_id -> (part_id, quantity, lead_time) for relaxed
+            aircraft on short parts
+        residual_stock (dict): part_id -> units left for the relaxed aircraft
+        time_limit (float): Solver time limit (seconds)
+        workers (int): CP-SAT search workers
+
+    Returns:
+        tuple: (placements dict or None, solver status name, sub-model objective)
+    """
+    horizon = PLANNING_HORIZON_DAYS
+    model = cp_model.CpModel()
+    intervals = []
+    demands = []
+    for d, used in enumerate(background):
+        if used:
+            intervals.append(model.NewFixedSizeIntervalVar(d, 1, f"fixed_d{d}"))
+            demands.append(used)
+
+    fixed_durations, crew_demands = requirements
+    start_day = {}
+    duration = {}
+    for aid in relaxed:
+        start_day[aid], duration[aid], interval = new_maintenance_interval(
+            model, aid, horizon - 1, fixed_durations[aid] if fixed_durations else None)
+        intervals.append(interval)
+        demands.append(crew_demands[aid] if crew_demands else 1)
+        model.AddHint(start_day[aid], hints[aid][0])
+        if fixed_durations is None:
+            model.AddHint(duration[aid], hints[aid][1])
+    model.AddCumulative(intervals, demands, CREW_AVAILABLE)
+
+    # Short parts: same stock/lead-time rule as add_parts_constraints, on the leftover stock
+    from_stock = {}
+    for aid, (part_id, qty, lead_time) in short_demand.items():
+        served = model.NewBoolVar(f"stock_{aid}")
+        model.Add(start_day[aid] >= lead_time).OnlyEnforceIf(served.Not())
+        from_stock.setdefault(part_id, []).append(served * qty)
+    for part_id, terms in from_stock.items():
+        model.Add(sum(terms) <= residual_stock[part_id])
+
+    # Relaxed aircraft with the same part and quantity (or no short part), duration
+    # and crew demand stay interchangeable
+    groups = {}
+    for aid in relaxed:
+        parts_key = short_demand[aid][:2] if aid in short_demand else None
+        demand = crew_demands[aid] if crew_demands else 1
+        key = (parts_key, fixed_durations[aid] if fixed_durations else None, demand)
+        groups.setdefault(key, {})[aid] = start_day[aid]
+    for (_, _, demand), group in groups.items():
+        add_urgency_ordering(model, group, weights, crew=CREW_AVAILABLE // demand)
+    model.Minimize(sum(start_day[aid] * weights[aid] for aid in relaxed))
+
+    solver = SolverConfig(workers=workers).apply(cp_model.CpSolver(), time_limit)
+    status = solver.Solve(model)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None, solver.StatusName(status), None
+    starts, lengths = read_solution(solver, start_day, duration, relaxed)
+    placements = {aid: (starts[aid], lengths[aid]) for aid in relaxed}
+    return placements, solver.StatusName(status), solver.ObjectiveValue()
+
+def _solve_lns_neighbourhood(params, *args):
+    """
+    Process-pool worker: applies the planning parameters and re-solves one neighbourhood.
+    """
+    globals().update(params)
+    return _lns_submodel(*args)
+
+def select_neighbourhood(strategy, ids, weight_values, start_values, size, rng):
+    """
+    Picks the aircraft to relax in one LNS move.
+
+    Args:
+        strategy (str): "window" (consecutive start days), "urgency" (consecutive
+            urgency ranks) or "random"
+        ids (ndarray): Aircraft IDs
+        weight_values (ndarray): Objective weight per aircraft, aligned with ids
+        start_values (ndarray): Incumbent start day per aircraft, aligned with ids
+        size (int): Number of aircraft to relax
+        rng (Generator): Random source
+
+    Returns:
+        list: aircraft_id to relax
+    """
+    size = min(size, len(ids))
+    if strategy == "random":
+        return ids[rng.choice(len(ids), size=size, replace=False)].tolist()
+    if strategy == "window":
+        order = np.argsort(start_values, kind="stable")
+    elif strategy == "urgency":
+        order = np.argsort(-weight_values, kind="stable")
+    else:
+        raise ValueError(f"Unknown LNS strategy '{strategy}', expected one of {LNS_STRATEGIES}")
+    first = rng.integers(0, len(ids) - size + 1)
+    return ids[order[first:first + size]].tolist()
+
+def lns_start_days(fleet_df, parts_df=None, parts_aware=False, weights=None,
+                   neighbourhood_size=LNS_NEIGHBOURHOOD_SIZE, iterations=LNS_ITERATIONS,
+                   parallel=LNS_PARALLEL_NEIGHBOURHOODS, strategies=LNS_STRATEGIES,
+                   time_limit=LNS_TIME_LIMIT, max_stall=LNS_MAX_STALL, on_solution=None, solver_config=None):
+    """
+    Large neighbourhood search over the interval model, for fleets where one
+    CP-SAT call on the whole model stalls at a poor solution.
+
+    Starts from the greedy plan, with part waits as release days when parts_aware
+    (or, when that plan overruns the horizon, from a short full-model solve hinted
+    with it). Each iteration
+    relaxes `parallel` neighbourhoods chosen by cycling through strategies,
+    re-solves each in a worker process with every other aircraft fixed, and
+    keeps the best improving one.
+
+    Args:
+        fleet_df (DataFrame): Fleet information
+        parts_df (DataFrame, optional): Parts inventory (required when parts_aware)
+        parts_aware (bool): Model part stock and lead times
+        weights (dict, optional): aircraft_id -> objective weight (default compute_weights)
+        neighbourhood_size (int): Aircraft relaxed per neighbourhood
+        iterations (int): Maximum number of iterations
+        parallel (int): Neighbourhoods solved concurrently per iteration
+        strategies (tuple): Neighbourhood strategies (see select_neighbourhood)
+        time_limit (float): Wall-clock budget for the whole search (seconds)
+        max_stall (int): Stop after this many consecutive iterations without improvement
+        on_solution (callable, optional): Called with {wall_time, objective} per improvement
+        solver_config (SolverConfig, optional): Settings for the initial solve and, with
+            workers split between them, the neighbourhood solves; the search itself
+            stops on the wall-clock budget, so it is not deterministic
+
+    Returns:
+        start_days (dict): aircraft_id -> start day offset
+        durations (dict): aircraft_id -> maintenance duration (days)
+        allocation (tuple or None): (part_ids, quantities, costs) when parts_aware
+        solve_info (dict): objective, status and lns_stats (initial objective and
+            per-iteration records)
+    """
+    started = time.perf_counter()
+    horizon = PLANNING_HORIZON_DAYS
+    if weights is None:
+        weights = compute_weights(fleet_df)
+    aircraft_list = fleet_df["aircraft_id"].tolist()
+
+    # Initial incumbent: the greedy plan, with part waits as release days
+    allocation = None
+    release_days = None
+    if parts_aware:
+        allocation = allocate_parts(len(aircraft_list), parts_df, respect_stock=False)
+        release_days = parts_release_days(aircraft_list, allocation[0], allocation[1], parts_df, weights)
+    start_days, durations, objective = greedy_schedule(fleet_df, weights, release_days)
+    if any(s >= horizon for s in start_days.values()):
+        model, start_day, duration, allocation, _ = build_model(
+            fleet_df, parts_df, "interval", parts_aware, weights)
+        for aid, s in start_days.items():
+            if s < horizon:
+                model.AddHint(start_day[aid], s)
+                model.AddHint(duration[aid], durations[aid])
+        solver = (solver_config or SolverConfig()).apply(cp_model.CpSolver(), LNS_INITIAL_TIME_LIMIT)
+        status = solver.Solve(model)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            raise RuntimeError("No feasible initial solution found for LNS")
+        start_days, durations = read_solution(solver, start_day, duration, aircraft_list)
+        objective = solver.ObjectiveValue()
+    initial_objective = float(objective)
+
+    # Short-part demand and stock, fixed for the whole search
+    short_demand = {}
+    on_hand = {}
+    if parts_aware:
+        short = short_part_demand(aircraft_list, allocation[0], allocation[1], parts_df)
+        stock = parts_df.set_index("part_id")
+        for aid, part_id, qty in zip(short["aircraft_id"], short["part_id"], short["quantity"]):
+            short_demand[aid] = (part_id, int(qty), int(stock.at[part_id, "lead_time_days"]))
+        on_hand = {part_id: int(stock.at[part_id, "quantity_on_hand"]) for part_id in short["part_id"].unique()}
+
+    ids = np.array(aircraft_list, dtype=object)
+    weight_values = np.array([weights[aid] for aid in aircraft_list], dtype=np.int64)
+    fixed_durations, demands = maintenance_requirements(fleet_df)
+    demand_values = np.array([demands[aid] for aid in aircraft_list] if demands else [1] * len(aircraft_list),
+                             dtype=np.int64)
+    rng = np.random.default_rng(SOLVER_SEED)
+    config = solver_config or SolverConfig()
+    params = {**planning_params(), **config.constants()}
+    sub_workers = max(1, config.workers // parallel)
+    num_days = horizon - 1 + (max(fixed_durations.values()) if fixed_durations else MAINT_DURATION_MAX)
+    iteration_stats = []
+    stalled = 0
+
+    with ProcessPoolExecutor(max_workers=parallel) as pool:
+        for iteration in range(iterations):
+            remaining_time = time_limit - (time.perf_counter() - started)
+            if remaining_time <= 0 or stalled >= max_stall:
+                break
+            sub_time_limit = min(LNS_SUBSOLVE_TIME_LIMIT, remaining_time)
+            start_values = np.array([start_days[aid] for aid in aircraft_list], dtype=np.int64)
+
+            # Crew usage and stock consumed by the whole incumbent, per day and per part
+            usage = np.zeros(num_days + 1, dtype=np.int64)
+            np.add.at(usage, start_values, demand_values)
+            np.add.at(usage, start_values + np.array([durations[aid] for aid in aircraft_list]), -demand_values)
+            usage = np.cumsum(usage)[:num_days]
+            consumed = {}
+            for aid, (part_id, qty, lead_time) in short_demand.items():
+                if start_days[aid] < lead_time:
+                    consumed[part_id] = consumed.get(part_id, 0) + qty
+
+            futures = []
+            for slot in range(parallel):
+                strategy = strategies[(iteration * parallel + slot) % len(strategies)]
+                relaxed = select_neighbourhood(strategy, ids, weight_values, start_values, neighbourhood_size, rng)
+                # Take the relaxed aircraft out of the background usage and stock
+                background = usage.copy()
+                residual = {}
+                for aid in relaxed:
+                    s, dur = start_days[aid], durations[aid]
+                    background[s:s + dur] -= demands[aid] if demands else 1
+                    if aid in short_demand:
+                        part_id, qty, lead_time = short_demand[aid]
+                        residual.setdefault(part_id, on_hand[part_id] - consumed.get(part_id, 0))
+                        if s < lead_time:
+                            residual[part_id] += qty
+                relaxed_short = {aid: short_demand[aid] for aid in relaxed if aid in short_demand}
+                relaxed_requirements = (
+                    {aid: fixed_durations[aid] for aid in relaxed} if fixed_durations else None,
+                    {aid: demands[aid] for aid in relaxed} if demands else None)
+                current = sum(start_days[aid] * weights[aid] for aid in relaxed)
+                future = pool.submit(
+                    _solve_lns_neighbourhood, params, relaxed, {aid: weights[aid] for aid in relaxed},
+                    {aid: (start_days[aid], durations[aid]) for aid in relaxed}, background.tolist(),
+                    relaxed_requirements, relaxed_short, residual, sub_time_limit, sub_workers)
+                futures.append((strategy, relaxed, current, future))
+
+            # Neighbourhoods were solved against the same incumbent, so only the best is applied
+            best = None
+            for strategy, relaxed, current, future in futures:
+                placements, status, sub_objective = future.result()
+                improvement = current - sub_objective if placements is not None else 0
+                iteration_stats.append({
+                    "iteration": iteration,
+                    "strategy": strategy,
+                    "relaxed": len(relaxed),
+                    "status": status,
+                    "improvement": improvement,
+                })
+                if improvement > 0 and (best is None or improvement > best[0]):
+                    best = (improvement, placements)
+            if best is None:
+                stalled += 1
+            else:
+                stalled = 0
+                objective -= best[0]
+                for aid, (s, dur) in best[1].items():
+                    start_days[aid] = s
+                    durations[aid] = dur
+                if on_solution is not None:
+                    on_solution({"wall_time": time.perf_counter() - started, "objective": float(objective)})
+
+    return start_days, durations, allocation, {
+        "engine": "lns",
+        "objective": float(objective),
+        "status": "FEASIBLE",
+        "solve_time": time.perf_counter() - started,
+        "lns_stats": {
+            "initial_objective": initial_objective,
+            "iterations": iteration_stats,
+        },
+    }
+
 # Save schedule to database
 def save_schedule_to_db(schedule_df):
     """
     Persists the maintenance schedule to the database.
-    Replaces existing schedule if any.
+    Replaces existing schedule if any, keeping the maintenance_records schema.
+    Each row records the solve's run ID (schedule_df.attrs["run_id"], if any), so
+    the dashboard only offers that run's alternatives.
     """
     conn = get_db_connection()
-    schedule_df.to_sql("maintenance_records", conn, if_exists="replace", index=False)
+    # Databases created before run_id was added keep their table (CREATE TABLE IF NOT EXISTS)
+    if "run_id" not in table_columns(conn, "maintenance_records"):
+        conn.execute("ALTER TABLE maintenance_records ADD COLUMN run_id TEXT")
+        conn.commit()
     conn.close()
+    bulk_load_table("maintenance_records", schedule_df.assign(run_id=schedule_df.attrs.get("run_id")))
     print("Maintenance schedule saved to database")
 
-# Run script directly
-if __name__ == "__main__":
+# Command line entry point
+def main():
+    parser = argparse.ArgumentParser(description="Solve the maintenance schedule and save it to the database")
+    parser.add_argument("--seed", type=int, default=SOLVER_SEED, help="CP-SAT random seed")
+    parser.add_argument("--workers", type=int, default=SOLVER_WORKERS, help="CP-SAT search workers")
+    parser.add_argument("--time-limit", type=float, default=SOLVER_TIME_LIMIT,
+                        help="Solver time limit (seconds; deterministic time with --deterministic)")
+    parser.add_argument("--interleave-search", action="store_true", default=SOLVER_INTERLEAVE_SEARCH,
+                        help="Interleave worker search in fixed batches")
+    parser.add_argument("--presolve-level", type=int, choices=[0, 1, 2], default=SOLVER_PRESOLVE_LEVEL,
+                        help="0 = off, 1 = single pass, 2 = full")
+    parser.add_argument("--log-search", action="store_true", default=SOLVER_LOG_SEARCH,
+                        help="Print CP-SAT search progress")
+    parser.add_argument("--deterministic", action="store_true", default=SOLVER_DETERMINISTIC,
+                        help="Identical inputs give identical schedules")
+    parser.add_argument("--gap-limit", type=float, default=SOLVER_RELATIVE_GAP_LIMIT,
+                        help="Stop once within this relative gap of the best bound (e.g. 0.001)")
+    parser.add_argument("--budget", type=float, default=SOLVER_WALL_TIME_BUDGET,
+                        help="Wall-clock budget for the whole solve, including model build (seconds)")
+    parser.add_argument("--top-k", type=int, default=1,
+                        help="Also save top-k - 1 near-optimal alternatives for the dashboard")
+    parser.add_argument("--shard", action="store_true",
+                        help="Solve each maintenance base separately in parallel (crew per base from CREW_BY_BASE)")
+    args = parser.parse_args()
+    if args.shard and args.top_k > 1:
+        parser.error("--top-k is not supported with --shard")
+    solver_config = SolverConfig(seed=args.seed, workers=args.workers, time_limit=args.time_limit,
+                                 interleave_search=args.interleave_search, presolve_level=args.presolve_level,
+                                 log_search=args.log_search, deterministic=args.deterministic,
+                                 relative_gap_limit=args.gap_limit, wall_time_budget=args.budget)
+
     fleet_df, parts_df = load_data()
-    schedule_df = generate_schedule(fleet_df, parts_df)
-    print(schedule_df)
+    resources = load_resources()
+    if resources is None:
+        print("No resources defined (resource tables empty): crew capacity only")
+    else:
+        print(f"{len(resources['catalog'])} resource(s) loaded")
+    if args.shard:
+        # Independent bases: solve each in parallel and merge
+        if "base" not in fleet_df.columns:
+            parser.error("--shard needs a 'base' column in the fleet table")
+        shared = shared_resources(fleet_df, resources)
+        if shared:
+            parser.error(f"--shard needs every resource to belong to one base; shared between bases: "
+                         f"{', '.join(shared)} (solve the whole fleet without --shard)")
+        print(f"Solving {fleet_df['base'].nunique()} base(s) separately (--shard)")
+        schedule_df = generate_schedule_sharded(fleet_df, parts_df, resources=resources, solver_config=solver_config,
+                                                warm_start=True, use_cache=True, record_run=True)
+        print(schedule_df)
+        if schedule_df.attrs.get("cache_hit"):
+            print("Schedule served from cache (run schedule_cache.py to invalidate)")
+        print("Per-base solves:", schedule_df.attrs["shards"])
+    else:
+        print("Solving the whole fleet in one model (--shard solves each base separately)")
+        schedule_df = generate_schedule(fleet_df, parts_df, warm_start=True, use_cache=True, resources=resources,
+                                        solver_config=solver_config, top_k=args.top_k, record_run=True)
+        print(schedule_df)
+        if schedule_df.attrs.get("cache_hit"):
+            print("Schedule served from cache (run schedule_cache.py to invalidate)")
+        else:
+            print("Warm-start hints:", schedule_df.attrs["hint_stats"])
+            stats = schedule_df.attrs["solve_stats"]
+            print(f"Model build {stats['build_time']:.2f}s ({stats['num_variables']} variables, "
+                  f"{stats['num_constraints']} constraints), solve {stats['wall_time']:.2f}s, "
+                  f"{stats['num_solutions']} solutions, gap {stats['gap']}")
     save_schedule_to_db(schedule_df)
+    if "alternatives" in schedule_df.attrs:
+        save_alternatives_to_db(schedule_df, schedule_df.attrs.get("run_id"))
+
+# Run script directly
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+replan.py
+----------
+Incremental re-optimization for single disruptions (AOG events, late parts,
+crew shortfalls).
+
+Instead of re-solving the whole fleet and overwriting maintenance_records,
+every assignment the disruption does not touch is fixed, only a neighbourhood
+around the disruption is re-solved, and the result is returned as a diff.
+
+Example:
+    diff = replan_disruption(schedule_df, fleet_df, parts_df, aircraft_removed=["AIR-1007"])
+    apply_schedule_diff(diff)
+"""
+
+import time
+import pandas as pd
+from ortools.sat.python import cp_model
+import optimizer
+from utils import get_db_connection, table_columns
+
+REPLAN_NEIGHBOURHOOD_DAYS = 3   # Days around the disruption whose aircraft may move
+REPLAN_MAX_FREE_AIRCRAFT = 200  # Aircraft freed around the disruption (nearest first), on top of those it hits
+REPLAN_TIME_LIMIT = 5.0         # Solver time limit per neighbourhood (seconds)
+
+def _remaining_parts(schedule_df, parts_df):
+    """
+    Stock left after the parts already allocated in schedule_df.
+    """
+    used = schedule_df.groupby("part_id")["part_quantity"].sum()
+    remaining = parts_df.copy()
+    remaining["quantity_on_hand"] = (
+        remaining["quantity_on_hand"] - remaining["part_id"].map(used).fillna(0).astype(int)).clip(lower=0)
+    return remaining
+
+def _greedy_placement(fleet_df, fixed, free, weights, blocked_days, crew, demands):
+    """
+    Places the free aircraft with optimizer.greedy_schedule around the fixed plan:
+    the crews the fixed aircraft and blocked days hold are passed as a capacity
+    calendar of one resource every free aircraft needs.
+
+    Returns:
+        dict or None: aircraft_id -> (start_day, duration), or None when the
+            greedy plan runs past the horizon
+    """
+    horizon = optimizer.PLANNING_HORIZON_DAYS
+    held = {}
+    for aid, (s, dur) in fixed.items():
+        for d in range(max(s, 0), s + dur):
+            held[d] = held.get(d, 0) + demands.get(aid, 1)
+    for d in blocked_days:
+        held[d] = crew
+    today = pd.Timestamp.now().normalize()
+    resources = {
+        "catalog": pd.DataFrame({"resource_id": ["REPLAN_CREW"], "resource_type": ["CREW"],
+                                 "description": ["Crew left by the fixed plan"], "capacity": [crew]}),
+        "calendar": pd.DataFrame({
+            "resource_id": "REPLAN_CREW",
+            "calendar_date": [(today + pd.Timedelta(days=d)).strftime("%Y-%m-%d") for d in held],
+            "capacity": [max(crew - used, 0) for used in held.values()],
+        }),
+        "demand": pd.DataFrame({"aircraft_id": free, "resource_id": "REPLAN_CREW",
+                                "quantity": [demands.get(aid, 1) for aid in free]}),
+    }
+    start_days, durations, _ = optimizer.greedy_schedule(
+        fleet_df[fleet_df["aircraft_id"].isin(set(free))], weights, resources=resources, crew=crew)
+    if any(s >= horizon for s in start_days.values()):
+        return None
+    return {aid: (start_days[aid], durations[aid]) for aid in free}
+
+def _solve_neighbourhood(fixed, free, weights, blocked_days, crew, hints, requirements, time_limit):
+    """
+    Re-solves the free aircraft with every fixed assignment as a constant.
+
+    Args:
+        fixed (dict): aircraft_id -> (start_day, duration) that must not move
+        free (list): aircraft_id to place
+        weights (dict): aircraft_id -> objective weight
+        blocked_days (set): day offsets with no crew available
+        crew (int): Crew capacity per day
+        hints (dict): aircraft_id -> (start_day, duration) used as hints
+        requirements (tuple): (durations, demands) from optimizer.maintenance_requirements
+        time_limit (float): Solver time limit (seconds)
+
+    Returns:
+        tuple: (placements dict or None if no solution was found, solver status name)
+    """
+    horizon = optimizer.PLANNING_HORIZON_DAYS
+    fixed_durations, crew_demands = requirements
+    model = cp_model.CpModel()
+    intervals = []
+    demands = []
+
+    # Fixed maintenance still running from today on keeps its crew
+    held = {}
+    for aid, (s, dur) in fixed.items():
+        start = max(s, 0)
+        if s + dur > start:
+            demand = crew_demands.get(aid, 1) if crew_demands else 1
+            intervals.append(model.NewFixedSizeIntervalVar(start, s + dur - start, f"fixed_{aid}"))
+            demands.append(demand)
+            for d in range(start, s + dur):
+                held[d] = held.get(d, 0) + demand
+    # Blocked days consume the crew left over (maintenance in progress carries on)
+    for d in blocked_days:
+        if crew - held.get(d, 0) > 0:
+            intervals.append(model.NewFixedSizeIntervalVar(d, 1, f"blocked_d{d}"))
+            demands.append(crew - held.get(d, 0))
+
+    start_day = {}
+    duration = {}
+    for aid in free:
+        start_day[aid], duration[aid], interval = optimizer.new_maintenance_interval(
+            model, aid, horizon - 1, fixed_durations[aid] if fixed_durations else None)
+        intervals.append(interval)
+        demands.append(crew_demands[aid] if crew_demands else 1)
+        if aid in hints and 0 <= hints[aid][0] < horizon:
+            model.AddHint(start_day[aid], hints[aid][0])
+    model.AddCumulative(intervals, demands, crew)
+
+    # Free aircraft with the same duration and crew demand are interchangeable
+    # against the same fixed background
+    for (_, demand, _), members in optimizer.requirement_groups(free, fixed_durations, crew_demands).items():
+        optimizer.add_urgency_ordering(model, {aid: start_day[aid] for aid in members}, weights,
+                                       crew=crew // demand)
+    model.Minimize(sum(start_day[aid] * weights[aid] for aid in free))
+
+    solver = optimizer.SolverConfig().apply(cp_model.CpSolver(), time_limit)
+    status = solver.Solve(model)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None, solver.StatusName(status)
+    starts, lengths = optimizer.read_solution(solver, start_day, duration, free)
+    placements = {aid: (starts[aid], lengths[aid]) for aid in free}
+    return placements, solver.StatusName(status)
+
+def replan_disruption(schedule_df, fleet_df, parts_df, aircraft_added=(), aircraft_removed=(),
+                      blocked_days=(), crew_available=None, neighbourhood_days=REPLAN_NEIGHBOURHOOD_DAYS,
+                      max_free_aircraft=REPLAN_MAX_FREE_AIRCRAFT, time_limit=REPLAN_TIME_LIMIT):
+    """
+    Re-plans the current schedule around a small disruption.
+
+    Aircraft directly hit by the disruption (on a blocked day, on a day now over
+    crew capacity, or newly added) are freed, together with every not-yet-started
+    aircraft starting within neighbourhood_days of the disrupted days (added
+    aircraft disrupt the front of the plan, removed aircraft the days they
+    held). Everything else is fixed. When the
+    neighbourhood has no feasible placement it is doubled, up to the whole plan.
+    At most max_free_aircraft aircraft are freed besides the hit ones, nearest to
+    the disruption first (also doubled with the neighbourhood). When the solver
+    stops without a solution for any other reason (time limit), the greedy
+    placement around the fixed aircraft is returned instead (status GREEDY).
+
+    Args:
+        schedule_df (DataFrame): Current schedule (as saved in maintenance_records)
+        fleet_df (DataFrame): Fleet information (for urgency weights)
+        parts_df (DataFrame): Parts inventory (for parts of added aircraft)
+        aircraft_added (iterable): Aircraft IDs to add to the plan
+        aircraft_removed (iterable): Aircraft IDs to drop from the plan (e.g. AOG)
+        blocked_days (iterable): Day offsets from today with no maintenance possible
+        crew_available (int, optional): New daily crew capacity (default CREW_AVAILABLE)
+        neighbourhood_days (int): Initial neighbourhood radius in days
+        max_free_aircraft (int): Initial cap on aircraft freed around the disruption
+        time_limit (float): Solver time limit per neighbourhood attempt (seconds)
+
+    Returns:
+        diff_df (DataFrame): Schedule-shaped rows for changed aircraft only, with a
+            "change" column (added, moved, removed) and previous_start/previous_end.
+            attrs holds the neighbourhood size, attempts and solve time.
+    """
+    started = time.perf_counter()
+    crew = crew_available if crew_available is not None else optimizer.CREW_AVAILABLE
+    horizon = optimizer.PLANNING_HORIZON_DAYS
+    weights = optimizer.compute_weights(fleet_df)
+    requirements = optimizer.maintenance_requirements(fleet_df)
+    demands = requirements[1] or {}
+    current = optimizer.schedule_day_offsets(schedule_df)
+    removed = [aid for aid in aircraft_removed if aid in current]
+    added = [aid for aid in aircraft_added if aid not in current]
+    blocked = {int(d) for d in blocked_days}
+    kept = {aid: v for aid, v in current.items() if aid not in set(removed)}
+
+    # Crew usage per day of the kept plan
+    last_day = max([s + dur for s, dur in kept.values()] + [horizon])
+    usage = [0] * last_day
+    for aid, (s, dur) in kept.items():
+        for d in range(max(s, 0), s + dur):
+            usage[d] += demands.get(aid, 1)
+
+    # Directly affected aircraft: not yet started and on a blocked or over-capacity day
+    hit_days = blocked | {d for d in range(last_day) if usage[d] > crew}
+    movable = {aid for aid, (s, _) in kept.items() if s >= 0}
+    # Every aircraft that may be placed must fit in the (possibly reduced) crew
+    short = [aid for aid in movable | set(added) if demands.get(aid, 1) > crew]
+    if short:
+        raise ValueError(f"Aircraft {sorted(short)} need up to {max(demands[aid] for aid in short)} crews "
+                         f"but only {crew} are available")
+    affected = {aid for aid in movable if hit_days.intersection(range(kept[aid][0], sum(kept[aid])))}
+    # Added aircraft compete for the front of the plan; removed aircraft free their crew days
+    disrupted_days = hit_days | (set(range(min(neighbourhood_days, horizon))) if added else set())
+    for aid in removed:
+        s, dur = current[aid]
+        disrupted_days.update(range(max(s, 0), s + dur))
+
+    # Distance in days from each movable aircraft's start to the nearest disrupted day
+    distance = {aid: min((abs(kept[aid][0] - d) for d in disrupted_days), default=last_day)
+                for aid in movable}
+
+    radius = neighbourhood_days
+    max_free = max_free_aircraft
+    attempts = 0
+    while True:
+        attempts += 1
+        # Nearest aircraft first (most urgent on ties), up to max_free besides the hit ones
+        near = sorted((aid for aid in movable - affected if distance[aid] <= radius),
+                      key=lambda aid: (distance[aid], -weights[aid]))
+        near = near[:max(max_free - len(affected) - len(added), 0)]
+        free = sorted(affected | set(near) | set(added), key=lambda aid: -weights[aid])
+        fixed = {aid: v for aid, v in kept.items() if aid not in set(free)}
+        # The greedy plan around the fixed aircraft is the hint, and the answer when
+        # the solver runs out of time without a solution
+        greedy = _greedy_placement(fleet_df, fixed, free, weights, blocked, crew, demands)
+        placements, status = _solve_neighbourhood(fixed, free, weights, blocked, crew, greedy or current,
+                                                  requirements, time_limit)
+        if placements is not None:
+            break
+        if status != "INFEASIBLE":
+            if greedy is None:
+                raise RuntimeError(f"No re-plan found within the time limit ({status})")
+            placements, status = greedy, "GREEDY"
+            break
+        if radius >= last_day and max_free >= len(movable):
+            raise RuntimeError(f"No feasible re-plan found ({status})")
+        radius *= 2
+        max_free *= 2
+
+    # Diff: only aircraft whose assignment changed
+    today = pd.Timestamp.now().normalize()
+    rows = []
+    previous = schedule_df.set_index("aircraft_id")
+    for aid in removed:
+        row = previous.loc[aid].to_dict()
+        rows.append({"aircraft_id": aid, **row, "change": "removed",
+                     "previous_start": row["schedule_start"], "previous_end": row["schedule_end"]})
+    for aid in free:
+        if aid in added or placements[aid] == kept[aid]:
+            continue
+        row = previous.loc[aid].to_dict()
+        s, dur = placements[aid]
+        rows.append({"aircraft_id": aid, **row,
+                     "schedule_start": today + pd.Timedelta(days=s),
+                     "schedule_end": today + pd.Timedelta(days=s + dur),
+                     "change": "moved",
+                     "previous_start": row["schedule_start"], "previous_end": row["schedule_end"]})
+    if added:
+        # Parts for added aircraft come out of the stock the current plan leaves over
+        added_fleet = fleet_df[fleet_df["aircraft_id"].isin(added)]
+        added_df = optimizer.build_schedule_df(
+            added_fleet, _remaining_parts(schedule_df, parts_df),
+            {aid: placements[aid][0] for aid in added}, {aid: placements[aid][1] for aid in added})
+        for row in added_df.to_dict("records"):
+            rows.append({**row, "change": "added", "previous_start": pd.NaT, "previous_end": pd.NaT})
+
+    diff_df = pd.DataFrame(rows, columns=list(schedule_df.columns) + ["change", "previous_start", "previous_end"])
+    diff_df.attrs = {
+        "free_aircraft": len(free),
+        "fixed_aircraft": len(fixed),
+        "attempts": attempts,
+        "status": status,
+        "elapsed": time.perf_counter() - started,
+    }
+    return diff_df
+
+def apply_schedule_diff(diff_df):
+    """
+    Applies a replan_disruption diff to maintenance_records in one transaction:
+    removed rows are deleted, moved rows get new dates and added rows are inserted.
+    """
+    def as_text(value):
+        return str(pd.Timestamp(value))
+
+    conn = get_db_connection()
+    with conn:
+        # The records no longer match the solve that wrote them (or its alternatives)
+        if "run_id" in table_columns(conn, "maintenance_records"):
+            conn.execute("UPDATE maintenance_records SET run_id = NULL")
+        for row in diff_df.to_dict("records"):
+            if row["change"] == "removed":
+                conn.execute("DELETE FROM maintenance_records WHERE aircraft_id = ?", (row["aircraft_id"],))
+            elif row["change"] == "moved":
+                conn.execute(
+                    "UPDATE maintenance_records SET schedule_start = ?, schedule_end = ? WHERE aircraft_id = ?",
+                    (as_text(row["schedule_start"]), as_text(row["schedule_end"]), row["aircraft_id"]))
+            else:
+                conn.execute(
+                    "INSERT INTO maintenance_records "
+                    "(aircraft_id, schedule_start, schedule_end, part_id, part_quantity, cost, status) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (row["aircraft_id"], as_text(row["schedule_start"]), as_text(row["schedule_end"]),
+                     row["part_id"], int(row["part_quantity"]), float(row["cost"]), row["status"]))
+    conn.close()
+    print(f"Applied schedule diff ({len(diff_df)} changed records)")
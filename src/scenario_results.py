@@ -0,0 +1,33 @@
+# scenario_results.py
+# Comparison rows of what-if scenario sweeps (see scenarios.py)
+
+from utils import get_db_connection
+
+SCENARIO_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS scenario_results (
+    run_id TEXT NOT NULL,                                     -- Identifies one sweep
+    scenario INTEGER NOT NULL,                                -- Scenario index within the sweep
+    crew INTEGER,                                             -- CREW_AVAILABLE
+    horizon_days INTEGER,                                     -- PLANNING_HORIZON_DAYS
+    duration_min INTEGER,                                     -- MAINT_DURATION_MIN
+    duration_max INTEGER,                                     -- MAINT_DURATION_MAX
+    status TEXT,                                              -- Solver status (NO_SOLUTION when none was found, INFEASIBLE when an aircraft needs more crews)
+    objective REAL,                                           -- Weighted start-day objective
+    makespan_days INTEGER,                                    -- Day the last maintenance ends
+    total_cost REAL,                                          -- Sum of allocated part costs
+    peak_crew INTEGER,                                        -- Highest number of crews busy on one day
+    solve_time REAL,                                          -- Solver wall time (seconds)
+    created_at TEXT,                                          -- When the sweep ran
+    PRIMARY KEY (run_id, scenario)
+);
+"""
+
+def save_scenario_results(results_df):
+    """
+    Appends a sweep's results to the scenario_results table.
+    """
+    conn = get_db_connection()
+    conn.executescript(SCENARIO_TABLE_SQL)
+    results_df.to_sql("scenario_results", conn, if_exists="append", index=False)
+    conn.close()
+    print(f"Saved {len(results_df)} scenario result(s) (run {results_df['run_id'].iat[0]})")
@@ -0,0 +1,172 @@
+"""
+scenarios.py
+-------------
+What-if scenario sweeps: solves the same fleet under a grid of planning
+parameters (crew, horizon, maintenance durations) in a process pool and
+stores one comparison row per scenario in the scenario_results table.
+MAINT_DURATION_MIN/MAX only matter for fleets without per-aircraft durations
+(see optimizer.maintenance_requirements).
+
+Run with:
+    python src/scenarios.py --crew 2 3 4 --horizon 30 45 --time-limit 10
+"""
+
+import argparse
+import itertools
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+import numpy as np
+import pandas as pd
+import optimizer
+from scenario_results import save_scenario_results
+
+# Default grid: optimizer constant -> values to try
+SCENARIO_GRID = {
+    "CREW_AVAILABLE": [2, 3],
+    "PLANNING_HORIZON_DAYS": [30, 45],
+    "MAINT_DURATION_MIN": [1],
+    "MAINT_DURATION_MAX": [2],
+}
+SCENARIO_TIME_LIMIT = 30.0  # Solver time limit per scenario (seconds)
+
+def expand_grid(grid):
+    """
+    Expands {constant: [values]} into one parameter dict per combination,
+    skipping combinations where MAINT_DURATION_MIN exceeds MAINT_DURATION_MAX.
+    """
+    names = list(grid)
+    scenarios = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        params = dict(zip(names, values))
+        if params.get("MAINT_DURATION_MIN", optimizer.MAINT_DURATION_MIN) > \
+                params.get("MAINT_DURATION_MAX", optimizer.MAINT_DURATION_MAX):
+            continue
+        scenarios.append(params)
+    return scenarios
+
+def _run_scenario(params, fleet_df, parts_df, formulation, engine, resources, parts_aware, solver_config):
+    """
+    Process-pool worker: applies one scenario's planning parameters, builds and
+    solves its model once (with the same resources and solve options as
+    optimizer.py), and measures the resulting schedule.
+    """
+    for name, value in params.items():
+        setattr(optimizer, name, value)
+    result = {
+        "crew": optimizer.CREW_AVAILABLE,
+        "horizon_days": optimizer.PLANNING_HORIZON_DAYS,
+        "duration_min": optimizer.MAINT_DURATION_MIN,
+        "duration_max": optimizer.MAINT_DURATION_MAX,
+    }
+    started = time.perf_counter()
+    # A crew smaller than some aircraft's crew demand makes the scenario infeasible
+    try:
+        _, demands = optimizer.maintenance_requirements(fleet_df)
+    except ValueError:
+        result.update({"status": "INFEASIBLE", "solve_time": time.perf_counter() - started})
+        return result
+    try:
+        start_days, durations, allocation, solve_info = optimizer.solve_start_days(
+            fleet_df, parts_df, formulation, parts_aware=parts_aware, engine=engine, resources=resources,
+            solver_config=solver_config)
+    except RuntimeError:
+        result.update({"status": "NO_SOLUTION", "solve_time": time.perf_counter() - started})
+        return result
+
+    starts = np.array(list(start_days.values()), dtype=np.int64)
+    ends = starts + np.array([durations[aid] for aid in start_days], dtype=np.int64)
+    crews = np.array([demands[aid] if demands else 1 for aid in start_days], dtype=np.int64)
+    makespan = int(ends.max(initial=0))
+    # Crews busy per day: +demand on each start day, -demand on each end day
+    busy = np.zeros(makespan + 1, dtype=np.int64)
+    np.add.at(busy, starts, crews)
+    np.add.at(busy, ends, -crews)
+    schedule_df = optimizer.build_schedule_df(fleet_df, parts_df, start_days, durations, allocation)
+    result.update({
+        "status": solve_info["status"],
+        "objective": solve_info["objective"],
+        "makespan_days": makespan,
+        "total_cost": float(schedule_df["cost"].sum()),
+        "peak_crew": int(np.cumsum(busy).max()),
+        "solve_time": solve_info["solve_time"],
+    })
+    return result
+
+def run_scenarios(fleet_df, parts_df, grid=SCENARIO_GRID, time_limit=SCENARIO_TIME_LIMIT,
+                  formulation=optimizer.MODEL_FORMULATION, engine=optimizer.SCHEDULER_ENGINE, max_workers=None,
+                  resources=None, parts_aware=False, solver_config=None):
+    """
+    Solves every scenario in the grid in parallel.
+
+    Args:
+        fleet_df (DataFrame): Fleet information
+        parts_df (DataFrame): Parts inventory information
+        grid (dict): Optimizer constant -> list of values (see SCENARIO_GRID)
+        time_limit (float): Solver time limit per scenario (seconds)
+        formulation (str): Model formulation used for every scenario
+        engine (str): Scheduler engine used for every scenario
+        max_workers (int, optional): Process pool size (default: one per CPU)
+        resources (dict, optional): Renewable resources (see optimizer.load_resources),
+            so scenarios compare against the model optimizer.py solves
+        parts_aware (bool): Model part stock and lead times (see optimizer.generate_schedule)
+        solver_config (SolverConfig, optional): Solver settings for every scenario;
+            its time limit is replaced by time_limit
+
+    Returns:
+        results_df (DataFrame): One row per scenario, in scenario_results layout
+    """
+    solver_config = replace(solver_config or optimizer.SolverConfig(), time_limit=time_limit)
+    run_id = uuid.uuid4().hex[:12]
+    created_at = pd.Timestamp.now().isoformat(timespec="seconds")
+    scenarios = expand_grid(grid)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = []
+        for params in scenarios:
+            params = {**optimizer.planning_params(), **params}
+            futures.append(pool.submit(_run_scenario, params, fleet_df, parts_df, formulation, engine, resources,
+                                       parts_aware, solver_config))
+        rows = []
+        for index, future in enumerate(futures):
+            rows.append({"run_id": run_id, "scenario": index, **future.result(), "created_at": created_at})
+
+    columns = ["run_id", "scenario", "crew", "horizon_days", "duration_min", "duration_max", "status",
+               "objective", "makespan_days", "total_cost", "peak_crew", "solve_time", "created_at"]
+    return pd.DataFrame(rows, columns=columns)
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve a grid of what-if planning scenarios")
+    parser.add_argument("--crew", type=int, nargs="+", default=SCENARIO_GRID["CREW_AVAILABLE"])
+    parser.add_argument("--horizon", type=int, nargs="+", default=SCENARIO_GRID["PLANNING_HORIZON_DAYS"])
+    parser.add_argument("--duration-min", type=int, nargs="+", default=SCENARIO_GRID["MAINT_DURATION_MIN"])
+    parser.add_argument("--duration-max", type=int, nargs="+", default=SCENARIO_GRID["MAINT_DURATION_MAX"])
+    parser.add_argument("--time-limit", type=float, default=SCENARIO_TIME_LIMIT,
+                        help="Solver time limit per scenario (seconds)")
+    parser.add_argument("--engine", choices=["cpsat", "greedy", "lns"], default=optimizer.SCHEDULER_ENGINE)
+    parser.add_argument("--parts-aware", action="store_true", help="Model part stock and lead times")
+    parser.add_argument("--seed", type=int, default=optimizer.SOLVER_SEED, help="CP-SAT random seed")
+    parser.add_argument("--deterministic", action="store_true", default=optimizer.SOLVER_DETERMINISTIC,
+                        help="Identical inputs give identical schedules")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: one per CPU)")
+    args = parser.parse_args()
+
+    grid = {
+        "CREW_AVAILABLE": args.crew,
+        "PLANNING_HORIZON_DAYS": args.horizon,
+        "MAINT_DURATION_MIN": args.duration_min,
+        "MAINT_DURATION_MAX": args.duration_max,
+    }
+    fleet_df, parts_df = optimizer.load_data()
+    # Same resources as optimizer.py, so the sweep compares against the production model
+    resources = optimizer.load_resources()
+    solver_config = optimizer.SolverConfig(seed=args.seed, deterministic=args.deterministic)
+    results_df = run_scenarios(fleet_df, parts_df, grid, args.time_limit, engine=args.engine,
+                               max_workers=args.workers, resources=resources, parts_aware=args.parts_aware,
+                               solver_config=solver_config)
+    print(results_df.to_string(index=False))
+    save_scenario_results(results_df)
+
+if __name__ == "__main__":
+    main()
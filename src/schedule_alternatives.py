@@ -0,0 +1,49 @@
+# schedule_alternatives.py
+# Near-optimal alternative schedules of one solve (optimizer.py --top-k), switchable in the dashboard
+
+import json
+import uuid
+import pandas as pd
+from utils import get_db_connection
+
+ALTERNATIVES_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS schedule_alternatives (
+    run_id TEXT NOT NULL,                                     -- Identifies one solve
+    rank INTEGER NOT NULL,                                    -- 0 = returned schedule, then alternatives in the order found
+    objective REAL,                                           -- Objective value of this alternative
+    status TEXT,                                              -- Solver status of this alternative
+    plan_date TEXT NOT NULL,                                  -- Day the start offsets count from (YYYY-MM-DD)
+    aircraft_json TEXT NOT NULL,                              -- JSON list of aircraft IDs
+    starts_json TEXT NOT NULL,                                -- JSON list of start day offsets, aligned with aircraft_json
+    durations_json TEXT NOT NULL,                             -- JSON list of durations (days), aligned with aircraft_json
+    created_at TEXT,                                          -- When the solve ran
+    PRIMARY KEY (run_id, rank)
+);
+"""
+
+# Save alternative schedules to database
+def save_alternatives_to_db(schedule_df, run_id=None):
+    """
+    Stores the alternatives of a top_k solve (schedule_df.attrs["alternatives"]) in
+    schedule_alternatives, one row per alternative, so the dashboard can switch
+    between them without re-solving. Part allocations do not depend on start
+    days, so only dates are stored.
+
+    Returns:
+        str: The run ID the rows were stored under
+    """
+    alternatives = schedule_df.attrs["alternatives"]
+    run_id = run_id or uuid.uuid4().hex[:12]
+    plan_date = pd.Timestamp.now().normalize().date().isoformat()
+    created_at = pd.Timestamp.now().isoformat(timespec="seconds")
+    aircraft_json = json.dumps(alternatives["aircraft"])
+    rows = [(run_id, solution["rank"], solution["objective"], solution["status"], plan_date, aircraft_json,
+             json.dumps(solution["starts"]), json.dumps(solution["durations"]), created_at)
+            for solution in alternatives["solutions"]]
+    conn = get_db_connection()
+    conn.executescript(ALTERNATIVES_TABLE_SQL)
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO schedule_alternatives VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    conn.close()
+    print(f"Saved {len(rows)} alternative schedule(s) (run {run_id})")
+    return run_id
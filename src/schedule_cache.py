@@ -0,0 +1,121 @@
+# schedule_cache.py
+# Persistent cache of solved schedules, keyed by a content hash of the optimizer inputs
+
+import hashlib
+import io
+import json
+import time
+import pandas as pd
+from utils import get_db_connection
+
+# Maximum number of cached schedules kept; least recently used entries are evicted first
+SCHEDULE_CACHE_MAX_ENTRIES = 32
+
+CACHE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS schedule_cache (
+    cache_key TEXT PRIMARY KEY,                               -- SHA-256 of fleet, parts and planning parameters
+    schedule_json TEXT NOT NULL,                              -- Cached schedule DataFrame (JSON, split orient)
+    attrs_json TEXT,                                          -- Solve metadata (objective, stats)
+    created_at REAL NOT NULL,                                 -- Unix time the entry was stored
+    last_used_at REAL NOT NULL                                -- Unix time of the last hit, used for LRU eviction
+);
+"""
+
+def _hash_frame(hasher, df):
+    """
+    Feeds a DataFrame's column names and row contents into a hash object.
+    Rows are hashed in a stable column order so column reordering does not change the key.
+    """
+    df = df[sorted(df.columns)]
+    hasher.update(json.dumps(list(df.columns)).encode())
+    hasher.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+
+def schedule_cache_key(fleet_df, parts_df, params, resources=None):
+    """
+    Builds a stable cache key for a solve.
+
+    Args:
+        fleet_df (DataFrame): Fleet information
+        parts_df (DataFrame): Parts inventory information
+        params (dict): Planning/solver parameters that affect the result (JSON-serializable)
+        resources (dict, optional): Resource catalog, calendar and demand DataFrames
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    hasher = hashlib.sha256()
+    _hash_frame(hasher, fleet_df)
+    _hash_frame(hasher, parts_df)
+    for name in sorted(resources or {}):
+        hasher.update(name.encode())
+        _hash_frame(hasher, resources[name])
+    hasher.update(json.dumps(params, sort_keys=True).encode())
+    return hasher.hexdigest()
+
+def get_cached_schedule(cache_key):
+    """
+    Returns the cached schedule for cache_key, or None on a miss.
+    A hit refreshes the entry's LRU timestamp.
+    """
+    conn = get_db_connection()
+    conn.executescript(CACHE_TABLE_SQL)
+    row = conn.execute(
+        "SELECT schedule_json, attrs_json FROM schedule_cache WHERE cache_key = ?", (cache_key,)
+    ).fetchone()
+    if row is None:
+        conn.close()
+        return None
+    conn.execute("UPDATE schedule_cache SET last_used_at = ? WHERE cache_key = ?", (time.time(), cache_key))
+    conn.commit()
+    conn.close()
+
+    schedule_json, attrs_json = row
+    df = pd.read_json(io.StringIO(schedule_json), orient="split", convert_dates=["schedule_start", "schedule_end"])
+    df.attrs = json.loads(attrs_json) if attrs_json else {}
+    df.attrs["cache_hit"] = True
+    return df
+
+def store_schedule(cache_key, schedule_df):
+    """
+    Stores a schedule under cache_key and evicts least recently used entries
+    beyond SCHEDULE_CACHE_MAX_ENTRIES.
+    """
+    now = time.time()
+    schedule_json = schedule_df.to_json(orient="split", date_format="iso", index=False)
+    attrs_json = json.dumps(schedule_df.attrs, default=str)
+    conn = get_db_connection()
+    conn.executescript(CACHE_TABLE_SQL)
+    conn.execute(
+        "INSERT OR REPLACE INTO schedule_cache (cache_key, schedule_json, attrs_json, created_at, last_used_at) "
+        "VALUES (?, ?, ?, ?, ?)",
+        (cache_key, schedule_json, attrs_json, now, now),
+    )
+    conn.execute(
+        "DELETE FROM schedule_cache WHERE cache_key NOT IN "
+        "(SELECT cache_key FROM schedule_cache ORDER BY last_used_at DESC LIMIT ?)",
+        (SCHEDULE_CACHE_MAX_ENTRIES,),
+    )
+    conn.commit()
+    conn.close()
+
+def invalidate_schedule_cache(cache_key=None):
+    """
+    Removes one cached schedule, or every cached schedule when cache_key is None.
+
+    Returns:
+        int: Number of entries removed
+    """
+    conn = get_db_connection()
+    conn.executescript(CACHE_TABLE_SQL)
+    if cache_key is None:
+        cur = conn.execute("DELETE FROM schedule_cache")
+    else:
+        cur = conn.execute("DELETE FROM schedule_cache WHERE cache_key = ?", (cache_key,))
+    conn.commit()
+    conn.close()
+    return cur.rowcount
+
+if __name__ == "__main__":
+    # Clear the whole cache (e.g. after changing solver code)
+    removed = invalidate_schedule_cache()
+    print(f"Removed {removed} cached schedule(s)")
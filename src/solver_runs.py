@@ -0,0 +1,123 @@
+# solver_runs.py
+# History of solves (best bound, final gap, why the search stopped), to see which fleet sizes hit the time limit
+
+import math
+import uuid
+import pandas as pd
+from utils import get_db_connection
+
+# Fleet size buckets used by time_limit_summary
+FLEET_SIZE_BINS = [0, 100, 1000, 10000, 100000, math.inf]
+
+SOLVER_RUNS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS solver_runs (
+    run_id TEXT PRIMARY KEY,                                  -- Identifies one solve (also used for its alternatives)
+    created_at TEXT NOT NULL,                                 -- When the solve ran
+    num_aircraft INTEGER,                                     -- Fleet size
+    horizon_days INTEGER,                                     -- PLANNING_HORIZON_DAYS
+    crew INTEGER,                                             -- CREW_AVAILABLE
+    engine TEXT,                                              -- cpsat, greedy, greedy-fallback or lns
+    formulation TEXT,                                         -- interval or daily
+    status TEXT,                                              -- Final solver status
+    stop_reason TEXT,                                         -- optimal, gap_limit, time_limit, infeasible, no_solution (NULL without CP-SAT stats)
+    objective REAL,                                           -- Objective of the returned schedule
+    best_bound REAL,                                          -- Best proven lower bound
+    gap REAL,                                                 -- Relative gap between objective and bound
+    time_limit REAL,                                          -- Search time limit in force (seconds)
+    gap_limit REAL,                                           -- Relative gap limit in force (0 = none)
+    build_time REAL,                                          -- Model build time (seconds)
+    solve_time REAL,                                          -- Search wall time (seconds)
+    num_variables INTEGER,                                    -- Model size
+    num_constraints INTEGER,                                  -- Model size
+    workers INTEGER,                                          -- CP-SAT search workers
+    deterministic INTEGER                                     -- 1 when solved in deterministic mode
+);
+"""
+
+def record_solver_run(schedule_df, params, run_id=None):
+    """
+    Appends one solve to solver_runs.
+
+    Args:
+        schedule_df (DataFrame): Schedule returned by generate_schedule (its attrs hold
+            the objective, status and solve_stats)
+        params (dict): num_aircraft, horizon_days, crew, formulation, workers, deterministic
+        run_id (str, optional): Run ID to store the solve under (default: a new one)
+
+    Returns:
+        str: The run ID
+    """
+    attrs = schedule_df.attrs
+    stats = attrs.get("solve_stats", {})
+    time_limit = stats.get("time_limit")
+    row = {
+        "run_id": run_id or uuid.uuid4().hex[:12],
+        "created_at": pd.Timestamp.now().isoformat(timespec="seconds"),
+        **params,
+        "engine": attrs.get("engine"),
+        "status": attrs.get("status"),
+        "stop_reason": stats.get("stop_reason"),
+        "objective": attrs.get("objective"),
+        "best_bound": stats.get("best_bound"),
+        "gap": stats.get("gap"),
+        "time_limit": time_limit if time_limit is not None and math.isfinite(time_limit) else None,
+        "gap_limit": stats.get("gap_limit"),
+        "build_time": stats.get("build_time"),
+        "solve_time": attrs.get("solve_time"),
+        "num_variables": stats.get("num_variables"),
+        "num_constraints": stats.get("num_constraints"),
+    }
+    row["deterministic"] = int(bool(row.get("deterministic")))
+    conn = get_db_connection()
+    conn.executescript(SOLVER_RUNS_TABLE_SQL)
+    columns = list(row)
+    with conn:
+        conn.execute(f"INSERT OR REPLACE INTO solver_runs ({', '.join(columns)}) "
+                     f"VALUES ({', '.join('?' for _ in columns)})", [row[c] for c in columns])
+    conn.close()
+    return row["run_id"]
+
+def load_solver_runs(limit=None):
+    """
+    Returns the recorded solves, newest first (at most limit rows when given).
+    """
+    conn = get_db_connection()
+    conn.executescript(SOLVER_RUNS_TABLE_SQL)
+    query = "SELECT * FROM solver_runs ORDER BY created_at DESC"
+    if limit is not None:
+        query += f" LIMIT {int(limit)}"
+    runs_df = pd.read_sql_query(query, conn)
+    conn.close()
+    return runs_df
+
+def time_limit_summary(runs_df=None):
+    """
+    Per fleet-size bucket (see FLEET_SIZE_BINS): how many CP-SAT solves stopped on
+    the time limit rather than proving optimality or reaching the gap limit, and
+    the gaps and solve times they ended with.
+
+    Returns:
+        DataFrame: runs, time_limit_hits, hit_rate, median_gap, max_gap,
+            median_solve_time and max_solve_time per bucket
+    """
+    if runs_df is None:
+        runs_df = load_solver_runs()
+    runs_df = runs_df[runs_df["stop_reason"].notna()].copy()
+    runs_df["fleet_size"] = pd.cut(runs_df["num_aircraft"], FLEET_SIZE_BINS, right=False)
+    runs_df["hit_time_limit"] = runs_df["stop_reason"].isin(["time_limit", "no_solution"])
+    summary = runs_df.groupby("fleet_size", observed=True).agg(
+        runs=("run_id", "count"),
+        time_limit_hits=("hit_time_limit", "sum"),
+        median_gap=("gap", "median"),
+        max_gap=("gap", "max"),
+        median_solve_time=("solve_time", "median"),
+        max_solve_time=("solve_time", "max"),
+    )
+    summary.insert(2, "hit_rate", summary["time_limit_hits"] / summary["runs"])
+    return summary
+
+if __name__ == "__main__":
+    # Which fleet sizes are running into the time limit
+    print(time_limit_summary().to_string())
+    print()
+    print(load_solver_runs(limit=20).to_string(index=False))
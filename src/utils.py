@@ -1,7 +1,10 @@
 # utils.py 
 # Centralized utility functions for database operations
 
+import atexit
+import os
 import sqlite3
+import threading
 import pandas as pd
 from pathlib import Path
 from typing import Tuple
@@ -11,16 +14,81 @@ from typing import Tuple
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DB_PATH = str(PROJECT_ROOT / "fleet_maintenance.db")
 
+# SQLite tuning
+# WAL lets readers (e.g. the dashboard) keep reading the last committed data while a writer (the optimizer) commits
+SQLITE_JOURNAL_MODE = "WAL"
+SQLITE_SYNCHRONOUS = "NORMAL"           # Safe with WAL: only the last commits can be lost on power failure
+SQLITE_CACHE_SIZE_KIB = 64 * 1024       # Page cache per connection
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024    # Bytes of the database file memory-mapped for reads
+SQLITE_BUSY_TIMEOUT = 30.0              # Seconds to wait for a lock before "database is locked"
+SQLITE_POOL_CONNECTIONS = True          # Reuse one connection per thread instead of connecting per call
+# Text format bulk_load_table writes datetime columns in (same as pandas to_sql)
+SQLITE_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Pooled connections of this process: thread -> {db_path: connection}
+_pool = threading.local()
+
+class PooledConnection(sqlite3.Connection):
+    """
+    Connection kept open for reuse by the thread that opened it.
+    close() only rolls back an uncommitted transaction, like a real close would
+    discard it; dispose() closes the underlying connection.
+    """
+    def close(self):
+        if self.in_transaction:
+            self.rollback()
+
+    def dispose(self):
+        super().close()
+
+def _connect(factory=sqlite3.Connection) -> sqlite3.Connection:
+    """
+    Opens a connection to DB_PATH with foreign keys enforced and the SQLITE_* settings applied.
+    """
+    conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+                           timeout=SQLITE_BUSY_TIMEOUT, factory=factory)
+    conn.execute("PRAGMA foreign_keys = ON;")
+    conn.execute(f"PRAGMA journal_mode = {SQLITE_JOURNAL_MODE};")
+    conn.execute(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS};")
+    conn.execute(f"PRAGMA cache_size = -{SQLITE_CACHE_SIZE_KIB};")
+    conn.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE};")
+    return conn
+
 # Database connection helper
 def get_db_connection() -> sqlite3.Connection:
     """
     Returns an SQLite database connection with foreign keys enforcement enabled.
     Foreign key support ensures referential integrity between fleet, parts_inventory, and maintenance_records tables.
+
+    With SQLITE_POOL_CONNECTIONS, each thread reuses one connection per database
+    (a new one after a fork); callers still call close() when done, which only
+    ends any open transaction.
     """
-    conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
-    conn.execute("PRAGMA foreign_keys = ON;")
+    if not SQLITE_POOL_CONNECTIONS:
+        return _connect()
+    if getattr(_pool, "pid", None) != os.getpid():
+        # Connections must not cross a fork
+        _pool.pid = os.getpid()
+        _pool.connections = {}
+    conn = _pool.connections.get(DB_PATH)
+    if conn is None:
+        conn = _connect(PooledConnection)
+        _pool.connections[DB_PATH] = conn
     return conn
 
+def close_db_connections():
+    """
+    Closes the calling thread's pooled connections (e.g. before deleting or
+    replacing the database file).
+    """
+    if getattr(_pool, "pid", None) == os.getpid():
+        for conn in _pool.connections.values():
+            conn.dispose()
+    _pool.connections = {}
+
+# Checkpoints the WAL into the database file when the main thread's connections close
+atexit.register(close_db_connections)
+
 # Execute SELECT queries returning pandas DataFrame
 def df_from_query(query: str, params: tuple = ()) -> pd.DataFrame:
     """
@@ -51,3 +119,78 @@ def execute_script(script: str):
     cur.executescript(script)
     conn.commit()
     conn.close()
+
+# Bulk-load a DataFrame into an existing table
+def bulk_load_table(table: str, df: pd.DataFrame, truncate: bool = True) -> int:
+    """
+    Loads a DataFrame into an existing table (as created by db_setup.SQL_SCRIPT) in one
+    transaction, with a single prepared INSERT run through executemany. Unlike
+    to_sql(if_exists="replace"), the table keeps its PRIMARY KEY, AUTOINCREMENT,
+    FOREIGN KEY and DEFAULT definitions and its indexes. Foreign keys are checked at
+    commit, so a parent table can be reloaded while child rows still reference it;
+    a violation rolls the whole load back.
+
+    Args:
+        table (str): Name of the existing table
+        df (pd.DataFrame): Rows to load; every column must exist in the table, table
+                           columns missing from df get their defaults
+        truncate (bool): Delete the table's current rows first (default True)
+
+    Returns:
+        int: Number of rows inserted
+    """
+    conn = get_db_connection()
+    with conn:
+        conn.execute("PRAGMA defer_foreign_keys = ON;")
+        if truncate:
+            table_columns(conn, table)
+            conn.execute(f'DELETE FROM "{table}"')
+        insert_rows(conn, table, df)
+    conn.close()
+    return len(df)
+
+# Column names of an existing table
+def table_columns(conn: sqlite3.Connection, table: str) -> list:
+    """
+    Returns the table's column names in schema order.
+    Raises ValueError when the table does not exist.
+    """
+    columns = [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+    if not columns:
+        raise ValueError(f"Table {table} does not exist (run db_setup.py first)")
+    return columns
+
+# Insert a batch of rows on an open connection
+def insert_rows(conn: sqlite3.Connection, table: str, df: pd.DataFrame):
+    """
+    Inserts a DataFrame's rows with one prepared INSERT through executemany, inside
+    the caller's transaction (used for each chunk of a streamed load).
+    Raises ValueError when a column is not in the table.
+    """
+    unknown = [col for col in df.columns if col not in table_columns(conn, table)]
+    if unknown:
+        raise ValueError(f"Columns {unknown} are not in table {table}")
+    conn.executemany(insert_sql(table, df.columns), sql_rows(df))
+
+# Prepared INSERT statement for a table
+def insert_sql(table: str, columns) -> str:
+    """
+    Returns an INSERT statement for the given columns with one ? placeholder per column.
+    """
+    names = ", ".join(f'"{col}"' for col in columns)
+    placeholders = ", ".join("?" for _ in columns)
+    return f'INSERT INTO "{table}" ({names}) VALUES ({placeholders})'
+
+# DataFrame rows as SQLite parameters
+def sql_rows(df: pd.DataFrame):
+    """
+    Returns an iterator of row tuples for executemany: native Python values, None for
+    missing ones, and datetimes in the TEXT format maintenance_records has always used.
+    """
+    values = []
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            series = series.dt.strftime(SQLITE_TIMESTAMP_FORMAT)
+        values.append(series.astype(object).where(series.notna(), None).tolist())
+    return zip(*values)